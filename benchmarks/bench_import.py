@@ -0,0 +1,91 @@
+"""Measure the cold-start cost of ``import funlib.geometry``.
+
+Each run imports the package in a fresh interpreter and reports the time
+spent in the import, relative to the import of the interpreter alone. The
+import must not load optional dependencies like numpy, nor any submodule
+of the package besides its core (see ``CORE_MODULES``); all other APIs are
+loaded on first access. The script fails if the median import time exceeds
+``--max-ms``, such that it can guard the startup cost in CI.
+
+Usage::
+
+    python benchmarks/bench_import.py [--runs N] [--max-ms MS]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# modules that must not be imported by ``import funlib.geometry``
+FORBIDDEN_MODULES = ["numpy", "tempfile"]
+
+# the only submodules of the package that ``import funlib.geometry`` may load
+CORE_MODULES = [
+    "funlib.geometry._memoize",
+    "funlib.geometry.coordinate",
+    "funlib.geometry.freezable",
+    "funlib.geometry.roi",
+]
+
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import funlib.geometry
+elapsed = time.perf_counter() - start
+forbidden = [m for m in {forbidden!r} if m in sys.modules]
+forbidden += [
+    m for m in sys.modules
+    if m.startswith("funlib.geometry.") and m not in {core!r}
+]
+print(elapsed * 1000, ",".join(forbidden))
+"""
+
+
+def run():
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            SCRIPT.format(forbidden=FORBIDDEN_MODULES, core=CORE_MODULES),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    elapsed = float(output[0])
+    forbidden = output[1].split(",") if len(output) > 1 else []
+    return elapsed, forbidden
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--max-ms", type=float, default=60.0)
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]}")
+    print()
+
+    timings = []
+    for _ in range(args.runs):
+        elapsed, forbidden = run()
+        if forbidden:
+            print(f"import funlib.geometry imported {', '.join(forbidden)}")
+            sys.exit(1)
+        timings.append(elapsed)
+
+    median = statistics.median(timings)
+    print(f"import funlib.geometry ({args.runs} runs)")
+    print(f"  min:    {min(timings):8.2f} ms")
+    print(f"  median: {median:8.2f} ms")
+    print(f"  max:    {max(timings):8.2f} ms")
+
+    if median > args.max_ms:
+        print()
+        print(f"median import time exceeds {args.max_ms:.2f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
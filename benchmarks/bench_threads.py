@@ -0,0 +1,104 @@
+"""Measure how Coordinate and Roi throughput scales with the number of threads.
+
+All threads share the same geometry objects without copying them. On a
+free-threaded build of CPython, throughput should grow (close to) linearly
+with the number of threads; a flat or decreasing throughput points at
+contention. With the GIL enabled, throughput is expected to stay flat.
+
+Usage::
+
+    python benchmarks/bench_threads.py [--iterations N] [--threads 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+from funlib.geometry import Coordinate, FrozenRoi, Roi
+
+VOXEL_SIZE = Coordinate(4, 4, 4)
+CONTEXT = Coordinate(8, 8, 8)
+TOTAL_ROI = FrozenRoi((0, 0, 0), (4096, 4096, 4096))
+BLOCK_ROI = FrozenRoi((100, 100, 100), (256, 256, 256))
+MUTABLE_BLOCK_ROI = Roi((100, 100, 100), (256, 256, 256))
+
+
+def coordinate_workload(iterations):
+    a = Coordinate(1, 2, 3)
+    for _ in range(iterations):
+        b = (a + VOXEL_SIZE) * 2 - CONTEXT
+        b.ceil_division(VOXEL_SIZE)
+
+
+def frozen_roi_workload(iterations):
+    for _ in range(iterations):
+        roi = BLOCK_ROI.shift(VOXEL_SIZE).grow(CONTEXT, CONTEXT)
+        roi.snap_to_grid(VOXEL_SIZE).intersect(TOTAL_ROI)
+
+
+def copied_roi_workload(iterations):
+    for _ in range(iterations):
+        roi = MUTABLE_BLOCK_ROI.copy().shift(VOXEL_SIZE).grow(CONTEXT, CONTEXT)
+        roi.snap_to_grid(VOXEL_SIZE).intersect(TOTAL_ROI)
+
+
+WORKLOADS = {
+    "Coordinate arithmetic": coordinate_workload,
+    "FrozenRoi (shared)": frozen_roi_workload,
+    "Roi (copied per use)": copied_roi_workload,
+}
+
+
+def run(workload, num_threads, iterations):
+    barrier = threading.Barrier(num_threads + 1)
+
+    def target():
+        barrier.wait()
+        workload(iterations)
+
+    threads = [threading.Thread(target=target) for _ in range(num_threads)]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return num_threads * iterations / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=[n for n in (1, 2, 4, 8, 16) if n <= (os.cpu_count() or 1)],
+    )
+    args = parser.parse_args()
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL enabled: {is_gil_enabled}")
+    print()
+
+    for name, workload in WORKLOADS.items():
+        print(name)
+        baseline = None
+        for num_threads in args.threads:
+            throughput = run(workload, num_threads, args.iterations)
+            if baseline is None:
+                baseline = throughput
+            print(
+                f"  {num_threads:3d} threads: {throughput:12,.0f} ops/s "
+                f"(x{throughput / baseline:.2f})"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
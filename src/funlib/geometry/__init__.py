@@ -1,6 +1,94 @@
+from typing import TYPE_CHECKING
+
 from .coordinate import Coordinate  # noqa
 from .roi import Roi  # noqa
 
+# Everything except Coordinate and Roi is imported on first access, to keep
+# the import of this package fast. Modules are not named like the functions
+# they export, such that importing them does not shadow the function.
+_lazy_exports = {
+    "FrozenRoi": "frozen_roi",
+    "RoiCache": "memoization",
+    "disable_roi_memoization": "memoization",
+    "enable_roi_memoization": "memoization",
+    "get_roi_cache": "memoization",
+    "memoize_roi_operations": "memoization",
+    "CoordinateInterner": "interning",
+    "get_default_interner": "interning",
+    "intern_coordinate": "interning",
+    "Tiling": "tiling",
+    "BlendingWeights": "blending",
+    "coalesce": "coalescing",
+    "DirtyRegions": "dirty_regions",
+    "count_voxels": "voxels",
+    "iter_voxel_coordinates": "voxels",
+    "PatchSampler": "sampling",
+    "RoiPipeline": "pipeline",
+    "RoiIndex": "distances",
+    "distance": "distances",
+    "read_rois": "join",
+    "sort_rois": "join",
+    "spatial_join": "join",
+    "write_rois": "join",
+    "RechunkPlan": "rechunking",
+    "plan_rechunk": "rechunking",
+    "OccupancyGrid": "occupancy",
+    "available_backends": "backend",
+    "get_backend": "backend",
+    "set_backend": "backend",
+    "use_backend": "backend",
+}
+
+__all__ = ["Coordinate", "Roi", *_lazy_exports]
+
+
+def __getattr__(name):
+    if name in _lazy_exports:
+        import importlib
+
+        module = importlib.import_module("." + _lazy_exports[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_exports))
+
+
+if TYPE_CHECKING:
+    from .backend import (  # noqa
+        available_backends,
+        get_backend,
+        set_backend,
+        use_backend,
+    )
+    from .blending import BlendingWeights  # noqa
+    from .coalescing import coalesce  # noqa
+    from .dirty_regions import DirtyRegions  # noqa
+    from .distances import RoiIndex, distance  # noqa
+    from .frozen_roi import FrozenRoi  # noqa
+    from .interning import (  # noqa
+        CoordinateInterner,
+        get_default_interner,
+        intern_coordinate,
+    )
+    from .join import read_rois, sort_rois, spatial_join, write_rois  # noqa
+    from .memoization import (  # noqa
+        RoiCache,
+        disable_roi_memoization,
+        enable_roi_memoization,
+        get_roi_cache,
+        memoize_roi_operations,
+    )
+    from .occupancy import OccupancyGrid  # noqa
+    from .pipeline import RoiPipeline  # noqa
+    from .rechunking import RechunkPlan, plan_rechunk  # noqa
+    from .sampling import PatchSampler  # noqa
+    from .tiling import Tiling  # noqa
+    from .voxels import count_voxels, iter_voxel_coordinates  # noqa
+
 __major__ = 0
 __minor__ = 3
 __patch__ = 0
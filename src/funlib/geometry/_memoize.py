@@ -0,0 +1,36 @@
+import contextvars
+import functools
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .memoization import RoiCache
+
+# The cache used by memoizable methods, if any. The scoped cache (set with a
+# context manager) takes precedence over the global one.
+scoped_cache: contextvars.ContextVar = contextvars.ContextVar(
+    "funlib_geometry_scoped_roi_cache", default=None
+)
+global_cache: Optional["RoiCache"] = None
+
+
+def active_cache():
+    cache = scoped_cache.get()
+    if cache is None:
+        cache = global_cache
+    return cache
+
+
+def memoizable(method):
+    """Decorate a pure method to use the active :class:`RoiCache`, if any.
+
+    The undecorated method is available as ``__wrapped__``.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = active_cache()
+        if cache is None:
+            return method(self, *args, **kwargs)
+        return cache.call(method, self, args, kwargs)
+
+    return wrapper
@@ -0,0 +1,9 @@
+def import_numpy(feature: str):
+    """Import ``numpy`` on first use, such that it remains an optional
+    dependency of this package."""
+
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(f"{feature} requires numpy to be installed") from e
+    return numpy
@@ -0,0 +1,100 @@
+import contextlib
+import contextvars
+import os
+from typing import Generator, List, Optional
+
+BACKENDS = ("python", "numpy")
+
+# The environment variable to select the backend for a process, e.g., for all
+# workers of a job.
+BACKEND_ENV_VAR = "FUNLIB_GEOMETRY_BACKEND"
+
+# The backend set with a context manager takes precedence over the global one.
+_scoped_backend: contextvars.ContextVar = contextvars.ContextVar(
+    "funlib_geometry_scoped_backend", default=None
+)
+_global_backend: Optional[str] = None
+_numpy_available: Optional[bool] = None
+
+
+def available_backends() -> List[str]:
+    """Get the names of the backends that can be used in this environment.
+
+    This does not import any of the backends.
+    """
+
+    global _numpy_available
+
+    if _numpy_available is None:
+        import importlib.util
+
+        _numpy_available = importlib.util.find_spec("numpy") is not None
+
+    return [b for b in BACKENDS if b == "python" or _numpy_available]
+
+
+def get_backend() -> str:
+    """Get the name of the active compute backend.
+
+    The backend is, in order of precedence, the one set with
+    :func:`use_backend`, :func:`set_backend`, or the environment variable
+    ``FUNLIB_GEOMETRY_BACKEND``. If none is set, ``"numpy"`` is used if it is
+    installed, ``"python"`` otherwise.
+    """
+
+    backend = _scoped_backend.get()
+    if backend is None:
+        backend = _global_backend
+    if backend is None:
+        backend = os.environ.get(BACKEND_ENV_VAR) or None
+        if backend is not None:
+            _check_backend(backend)
+    if backend is None:
+        backend = available_backends()[-1]
+    return backend
+
+
+def set_backend(backend: Optional[str]) -> None:
+    """Select the compute backend for all threads.
+
+    The backend only chooses between the implementations of operations that
+    have both (e.g., :meth:`RoiPipeline.apply_many`). Features that require
+    ``numpy`` (e.g., :class:`BlendingWeights`) use it regardless of the
+    selected backend.
+
+    Args:
+
+        backend (``str``, optional):
+
+            ``"python"`` to only use pure Python code or ``"numpy"`` to use
+            vectorized kernels for batch operations. ``None`` restores the
+            automatic selection.
+    """
+
+    global _global_backend
+
+    if backend is not None:
+        _check_backend(backend)
+    _global_backend = backend
+
+
+@contextlib.contextmanager
+def use_backend(backend: str) -> Generator[str, None, None]:
+    """Select the compute backend within a ``with`` block, in the current
+    thread (or ``asyncio`` task) only. See :func:`set_backend`."""
+
+    _check_backend(backend)
+    token = _scoped_backend.set(backend)
+    try:
+        yield backend
+    finally:
+        _scoped_backend.reset(token)
+
+
+def _check_backend(backend: str) -> None:
+    if backend not in BACKENDS:
+        raise RuntimeError(
+            "Unknown backend %s, use one of %s" % (backend, ", ".join(BACKENDS))
+        )
+    if backend not in available_backends():
+        raise RuntimeError("Backend %s is not installed" % backend)
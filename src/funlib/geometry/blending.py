@@ -0,0 +1,195 @@
+import functools
+import math
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
+
+from ._numpy import import_numpy
+from .coordinate import Coordinate
+from .tiling import Tiling
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class BlendingWeights:
+    """Per-block blending weights for stitching overlapping blocks.
+
+    For a :class:`Tiling` with context, the read ROIs of neighbouring blocks
+    overlap by ``2 * context``. Inside each overlap, the weights of a block
+    ramp from 0 to 1 (``"linear"`` or ``"cosine"``), such that the ramps of two
+    neighbours sum up to one. Sides of a block that face the boundary of the
+    tiling have no neighbour and are not ramped.
+
+    The weights are separable and only depend on the shape of a block and on
+    which of its sides have neighbours. There are therefore only a few distinct
+    weight arrays (interior, face, edge, and corner blocks, plus the truncated
+    blocks at the end of each dimension). They are computed once and cached;
+    the returned arrays are read-only and shared between blocks::
+
+        weights = BlendingWeights(tiling, voxel_size=(4, 4))
+        for index in tiling.block_indices():
+            prediction = predict(tiling.read_roi(index))
+            output[...] += weights.weights(index) * prediction
+        output /= weights.normalization()
+
+    Requires ``numpy``.
+
+    Args:
+
+        tiling (:class:`Tiling`):
+
+            The tiling to compute weights for. The total ROI, block shape, and
+            context have to be multiples of ``voxel_size``.
+
+        voxel_size (:class:`Coordinate` or ``tuple``, optional):
+
+            The voxel size of the arrays to blend. Defaults to one in each
+            dimension.
+
+        mode (string, optional):
+
+            The shape of the ramps in the overlap zones, either ``"linear"`` or
+            ``"cosine"``. Defaults to ``"linear"``.
+
+        dtype (numpy dtype, optional):
+
+            The data type of the weight arrays. Defaults to ``float32``.
+    """
+
+    def __init__(
+        self,
+        tiling: Tiling,
+        voxel_size: Optional[Iterable[int]] = None,
+        mode: str = "linear",
+        dtype: str = "float32",
+    ):
+        if voxel_size is None:
+            voxel_size = (1,) * tiling.dims
+        voxel_size = Coordinate(voxel_size)
+
+        assert voxel_size.dims == tiling.dims, (
+            "dimension of voxel size does not match tiling"
+        )
+        if not tiling.total_roi.empty:
+            assert tiling.total_roi.begin.is_multiple_of(voxel_size), (
+                "total ROI offset is not a multiple of voxel size"
+            )
+            assert tiling.total_roi.shape.is_multiple_of(voxel_size), (
+                "total ROI shape is not a multiple of voxel size"
+            )
+        assert tiling.block_shape.is_multiple_of(voxel_size), (
+            "block shape is not a multiple of voxel size"
+        )
+        assert tiling.context.is_multiple_of(voxel_size), (
+            "context is not a multiple of voxel size"
+        )
+
+        if mode not in ("linear", "cosine"):
+            raise RuntimeError("Unknown mode %s for BlendingWeights" % mode)
+
+        self.tiling = tiling
+        self.voxel_size = voxel_size
+        self.mode = mode
+        self.dtype = dtype
+
+        # ramp width in voxels per dimension
+        self.__ramp_widths = (tiling.context * 2) // voxel_size
+
+        self.__ramps: Dict[int, "np.ndarray"] = {}
+        self.__weights: Dict[Tuple, "np.ndarray"] = {}
+        self.__normalization: Optional["np.ndarray"] = None
+
+    def weights(self, index: Iterable[int]) -> "np.ndarray":
+        """Get the weights for the read ROI of the block with the given grid
+        index.
+
+        The returned array is shared with all blocks of the same kind and can
+        not be written to.
+        """
+
+        index = Coordinate(index)
+        shape = self.tiling.read_roi(index).shape // self.voxel_size
+        neighbours = tuple(
+            (i > 0, i < n - 1) for i, n in zip(index, self.tiling.blocks_per_axis)
+        )
+
+        key = (shape, neighbours)
+        if key not in self.__weights:
+            self.__weights[key] = self.__compute_weights(shape, neighbours)
+
+        return self.__weights[key]
+
+    def normalization(self) -> "np.ndarray":
+        """Get the sum of the weights of all blocks over the total read ROI of
+        the tiling.
+
+        Inside the total (write) ROI of the tiling, this is one everywhere if
+        the block shape is at least twice the context.
+        """
+
+        if self.__normalization is None:
+            np = import_numpy("BlendingWeights")
+
+            if self.tiling.total_roi.empty:
+                normalization = np.zeros((0,) * self.tiling.dims, dtype=self.dtype)
+            else:
+                total_read_roi = self.tiling.total_read_roi
+                normalization = np.zeros(
+                    total_read_roi.shape // self.voxel_size, dtype=self.dtype
+                )
+                for index in self.tiling.block_indices():
+                    read_roi = self.tiling.read_roi(index) - total_read_roi.begin
+                    normalization[(read_roi // self.voxel_size).to_slices()] += (
+                        self.weights(index)
+                    )
+
+            normalization.flags.writeable = False
+            self.__normalization = normalization
+
+        return self.__normalization
+
+    @property
+    def cache_size(self) -> int:
+        """The number of distinct weight arrays computed so far."""
+        return len(self.__weights)
+
+    def clear_cache(self) -> None:
+        """Release all cached weight arrays and the normalization."""
+
+        self.__weights.clear()
+        self.__normalization = None
+
+    def __compute_weights(
+        self, shape: Coordinate, neighbours: Tuple[Tuple[bool, bool], ...]
+    ) -> "np.ndarray":
+        np = import_numpy("BlendingWeights")
+
+        profiles = []
+        for length, width, (low, high) in zip(shape, self.__ramp_widths, neighbours):
+            profile = np.ones(length, dtype=self.dtype)
+            ramp = self.__ramp(width)
+            if low:
+                profile[:width] *= ramp
+            if high:
+                profile[length - width :] *= ramp[::-1]
+            profiles.append(profile)
+
+        weights = functools.reduce(np.multiply.outer, profiles).astype(self.dtype)
+        weights.flags.writeable = False
+
+        return weights
+
+    def __ramp(self, width: int) -> "np.ndarray":
+        if width in self.__ramps:
+            return self.__ramps[width]
+
+        np = import_numpy("BlendingWeights")
+
+        # sample at voxel centers, such that ramp + ramp[::-1] == 1
+        x = (np.arange(width, dtype="float64") + 0.5) / width
+        if self.mode == "cosine":
+            x = 0.5 - 0.5 * np.cos(math.pi * x)
+
+        ramp = x.astype(self.dtype)
+        self.__ramps[width] = ramp
+
+        return ramp
@@ -0,0 +1,468 @@
+import bisect
+import itertools
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .coordinate import Coordinate
+from .roi import Roi
+
+# a ROI as tuples (begin, end), with infinite bounds along unbounded axes
+Box = Tuple[Tuple[float, ...], Tuple[float, ...]]
+
+# the largest grid (in cells) that a component is partitioned on
+_MAX_PARTITION_CELLS = 2**16
+
+
+def coalesce(rois: Iterable[Roi], disjoint: bool = False) -> List[Roi]:
+    """Merge ROIs into fewer, larger ROIs that cover exactly the same region.
+
+    ROIs that overlap or share (part of) a face are grouped into connected
+    components. In each component, pairs of ROIs whose union is again a box
+    are merged repeatedly. If more than one ROI remains, the union of the
+    component is also partitioned into disjoint boxes by greedily growing a
+    box from the first uncovered cell (in C order) of the grid induced by the
+    boundaries of its ROIs, first along the last dimension, then along the
+    preceding ones. The partition is used if it has fewer boxes, and skipped
+    if the grid has more than ``2**16`` cells. The result never has more ROIs
+    than the input, and is minimal for many common cases (e.g., when the ROIs
+    tile a box)::
+
+        coalesce([
+            Roi((0, 0), (10, 10)),
+            Roi((10, 0), (10, 10)),
+            Roi((0, 10), (20, 10)),
+        ])
+        # [Roi((0, 0), (20, 20))]
+
+    Candidates for merging are found with hash grids, such that the runtime
+    grows about linearly with the number of ROIs if they are of similar size.
+    Empty ROIs are ignored. The returned ROIs are sorted by their offset.
+
+    Args:
+
+        rois (iterable of :class:`Roi`):
+
+            The bounded ROIs to coalesce.
+
+        disjoint (``bool``, optional):
+
+            If set, the returned ROIs do not overlap. Components with
+            overlapping ROIs are always partitioned (if the grid is too large,
+            by subtracting the ROIs from each other), which can result in more
+            ROIs than the input.
+    """
+
+    rois = [roi for roi in rois if not roi.empty]
+    if not rois:
+        return []
+
+    dims = rois[0].dims
+    for roi in rois:
+        assert roi.dims == dims, "can only coalesce ROIs of equal dimensions"
+        assert not roi.unbounded, "can only coalesce bounded ROIs"
+
+    coalesced = []
+    for component in _connected_components(rois):
+        if len(component) > 1:
+            component = _merge_exact(component)
+        if len(component) > 1:
+            overlapping = disjoint and _overlapping(component)
+            partitioned = _partition(component)
+            if partitioned is None and overlapping:
+                partitioned = _split_overlaps(component)
+            if partitioned is not None:
+                partitioned = _merge_exact(partitioned)
+                if len(partitioned) < len(component) or overlapping:
+                    component = partitioned
+        coalesced.extend(component)
+
+    return sorted(coalesced, key=lambda roi: roi.begin)
+
+
+def _to_box(roi: Roi) -> Box:
+    begin = tuple(-math.inf if o is None else o for o in roi.offset)
+    end = tuple(
+        math.inf if o is None or s is None else o + s
+        for o, s in zip(roi.offset, roi.shape)
+    )
+    return begin, end
+
+
+def _to_roi(box: Box) -> Roi:
+    begin, end = box
+    return Roi(
+        tuple(None if b == -math.inf else int(b) for b in begin),
+        tuple(None if b == -math.inf else int(e - b) for b, e in zip(begin, end)),
+    )
+
+
+def _box_union(a: Box, b: Box) -> Optional[Box]:
+    """Get the union of two non-empty boxes if it is a box itself, otherwise
+    ``None``.
+
+    This is the case if one contains the other, or if both have the same
+    extent along all but one axis, along which they overlap or touch.
+    """
+
+    (begin_a, end_a), (begin_b, end_b) = a, b
+    a_contains_b = b_contains_a = True
+    axis = None
+    for d in range(len(begin_a)):
+        ba, ea, bb, eb = begin_a[d], end_a[d], begin_b[d], end_b[d]
+        if ba == bb and ea == eb:
+            continue
+        a_contains_b = a_contains_b and ba <= bb and eb <= ea
+        b_contains_a = b_contains_a and bb <= ba and ea <= eb
+        if axis is not None and not (a_contains_b or b_contains_a):
+            return None
+        axis = d
+
+    if a_contains_b:
+        return a
+    if b_contains_a:
+        return b
+
+    assert axis is not None
+    if begin_b[axis] > end_a[axis] or begin_a[axis] > end_b[axis]:
+        return None
+
+    begin, end = list(begin_a), list(end_a)
+    begin[axis] = min(begin_a[axis], begin_b[axis])
+    end[axis] = max(end_a[axis], end_b[axis])
+    return tuple(begin), tuple(end)
+
+
+class _ExactMerger:
+    """A set of non-empty ROIs, in which each added ROI is merged with the
+    tracked ones as long as their union is a ROI again.
+
+    Merge candidates are found with a hierarchy of hash grids, such that only
+    ROIs close to the added one have to be compared, on plain tuples. Level
+    ``l`` has cells of ``2**l`` times the median shape of the tracked ROIs
+    (chosen again whenever their number doubled), and holds the ROIs that fit
+    into such a cell, but not into the next smaller one. Each ROI is registered in the (at most ``2**dims``)
+    cells of its level it overlaps or touches. Unbounded ROIs are compared to
+    every added ROI. The ROIs are kept in the order they were added or last
+    merged.
+    """
+
+    def __init__(self):
+        self.__entries: Dict[int, Tuple[Box, Optional[Roi]]] = {}
+        self.__cell_size: Optional[Tuple[int, ...]] = None
+        self.__levels: Dict[int, Dict[Tuple[int, ...], Set[int]]] = {}
+        self.__level_entries: Dict[int, Set[int]] = {}
+        self.__unbounded: Set[int] = set()
+        self.__hashed = 0
+        self.__ids = itertools.count()
+
+    def add(self, roi: Roi) -> None:
+        box = _to_box(roi)
+        kept: Optional[Roi] = roi
+
+        merging = True
+        while merging:
+            merging = False
+            for i in self.__candidates(box):
+                other, other_roi = self.__entries[i]
+                union = _box_union(box, other)
+                if union is None:
+                    continue
+                if union is other:
+                    kept = other_roi
+                elif union is not box:
+                    kept = None
+                box = union
+                self.__remove(i)
+                merging = True
+                break
+
+        i = next(self.__ids)
+        self.__entries[i] = (box, kept)
+        if len(self.__entries) >= 2 * self.__hashed:
+            self.__rehash()
+        else:
+            self.__insert(i, box)
+
+    def rois(self) -> List[Roi]:
+        rois = []
+        for i, (box, roi) in self.__entries.items():
+            if roi is None:
+                roi = _to_roi(box)
+                self.__entries[i] = (box, roi)
+            rois.append(roi)
+        return rois
+
+    def clear(self) -> None:
+        self.__entries.clear()
+        self.__cell_size = None
+        self.__levels.clear()
+        self.__level_entries.clear()
+        self.__unbounded.clear()
+        self.__hashed = 0
+
+    def __level(self, box: Box) -> Optional[int]:
+        """Get the level of the smallest cells ``box`` fits into, or ``None``
+        if it is unbounded."""
+
+        begin, end = box
+        if self.__cell_size is None or math.inf in end:
+            return None
+
+        level = 0
+        for b, e, c in zip(begin, end, self.__cell_size):
+            while e - b > c << level:
+                level += 1
+        return level
+
+    def __cell_ranges(self, box: Box, level: int) -> List[range]:
+        """Get the ranges of cells of ``level`` that ``box`` overlaps or
+        touches."""
+
+        assert self.__cell_size is not None
+        begin, end = box
+        return [
+            range(int(b // (c << level)), int(e // (c << level)) + 1)
+            for b, e, c in zip(begin, end, self.__cell_size)
+        ]
+
+    def __candidates(self, box: Box) -> List[int]:
+        if self.__level(box) is None:
+            return list(self.__entries)
+
+        candidates = set(self.__unbounded)
+        for level, cells in self.__levels.items():
+            ranges = self.__cell_ranges(box, level)
+            if math.prod(len(r) for r in ranges) > len(self.__level_entries[level]):
+                candidates.update(self.__level_entries[level])
+                continue
+            for cell in itertools.product(*ranges):
+                candidates.update(cells.get(cell, ()))
+
+        return sorted(candidates)
+
+    def __insert(self, i: int, box: Box) -> None:
+        level = self.__level(box)
+        if level is None:
+            self.__unbounded.add(i)
+            return
+
+        cells = self.__levels.setdefault(level, {})
+        self.__level_entries.setdefault(level, set()).add(i)
+        for cell in itertools.product(*self.__cell_ranges(box, level)):
+            cells.setdefault(cell, set()).add(i)
+
+    def __remove(self, i: int) -> None:
+        box, _ = self.__entries.pop(i)
+        level = self.__level(box)
+        if level is None:
+            self.__unbounded.remove(i)
+            return
+
+        cells = self.__levels[level]
+        for cell in itertools.product(*self.__cell_ranges(box, level)):
+            ids = cells[cell]
+            ids.remove(i)
+            if not ids:
+                del cells[cell]
+        self.__level_entries[level].remove(i)
+        if not self.__level_entries[level]:
+            del self.__levels[level]
+            del self.__level_entries[level]
+
+    def __rehash(self) -> None:
+        shapes = [
+            [int(e - b) for b, e in zip(*box)]
+            for box, _ in self.__entries.values()
+            if math.inf not in box[1]
+        ]
+        if shapes:
+            self.__cell_size = tuple(
+                max(1, sorted(extents)[len(extents) // 2]) for extents in zip(*shapes)
+            )
+        self.__levels.clear()
+        self.__level_entries.clear()
+        self.__unbounded.clear()
+        self.__hashed = len(self.__entries)
+        for i, (box, _) in self.__entries.items():
+            self.__insert(i, box)
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+def _merge_exact(rois: List[Roi]) -> List[Roi]:
+    """Repeatedly replace pairs of ROIs by their union, if it is a ROI."""
+
+    merger = _ExactMerger()
+    for roi in rois:
+        merger.add(roi)
+    return merger.rois()
+
+
+def _close_pairs(boxes: List[Box]) -> Set[Tuple[int, int]]:
+    """Get all pairs of bounded boxes that overlap or touch (and some that do
+    not), using a hash grid with cells of the median shape of the boxes."""
+
+    dims = len(boxes[0][0])
+    cell_size = [
+        max(1, int(sorted(end[d] - begin[d] for begin, end in boxes)[len(boxes) // 2]))
+        for d in range(dims)
+    ]
+
+    cells: Dict[Tuple[int, ...], List[int]] = {}
+    large = []
+    for i, (begin, end) in enumerate(boxes):
+        ranges = [
+            range(int(b // c), int(e // c) + 1)
+            for b, e, c in zip(begin, end, cell_size)
+        ]
+        if math.prod(len(r) for r in ranges) > 4**dims:
+            large.append(i)
+            continue
+        for cell in itertools.product(*ranges):
+            cells.setdefault(cell, []).append(i)
+
+    pairs = set()
+    for ids in cells.values():
+        pairs.update(itertools.combinations(ids, 2))
+    for i in large:
+        pairs.update((min(i, j), max(i, j)) for j in range(len(boxes)) if j != i)
+
+    return pairs
+
+
+def _overlapping(rois: List[Roi]) -> bool:
+    """Test if any two of the ROIs intersect."""
+
+    boxes = [_to_box(roi) for roi in rois]
+    for i, j in _close_pairs(boxes):
+        (begin_a, end_a), (begin_b, end_b) = boxes[i], boxes[j]
+        if all(
+            ba < eb and bb < ea
+            for ba, ea, bb, eb in zip(begin_a, end_a, begin_b, end_b)
+        ):
+            return True
+
+    return False
+
+
+def _connected_components(rois: List[Roi]) -> List[List[Roi]]:
+    """Group ROIs that overlap or share (part of) a face. ROIs that only meet
+    at an edge or corner can not be merged and are kept apart."""
+
+    boxes = [_to_box(roi) for roi in rois]
+    parents = list(range(len(rois)))
+
+    def find(i: int) -> int:
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    def connected(a: Box, b: Box) -> bool:
+        contacts = 0
+        for ba, ea, bb, eb in zip(a[0], a[1], b[0], b[1]):
+            if ba > eb or bb > ea:
+                return False
+            if ba == eb or bb == ea:
+                contacts += 1
+        return contacts <= 1
+
+    for i, j in _close_pairs(boxes):
+        if find(i) != find(j) and connected(boxes[i], boxes[j]):
+            parents[find(i)] = find(j)
+
+    components: Dict[int, List[Roi]] = {}
+    for i, roi in enumerate(rois):
+        components.setdefault(find(i), []).append(roi)
+
+    return list(components.values())
+
+
+def _partition(rois: List[Roi]) -> Optional[List[Roi]]:
+    """Partition the union of ROIs into disjoint boxes on the grid induced by
+    their boundaries, or return ``None`` if the grid is too large."""
+
+    dims = rois[0].dims
+    boundaries = [
+        sorted(set(roi.begin[d] for roi in rois) | set(roi.end[d] for roi in rois))
+        for d in range(dims)
+    ]
+    if math.prod(len(b) - 1 for b in boundaries) > _MAX_PARTITION_CELLS:
+        return None
+
+    def cell_range(roi: Roi, d: int) -> range:
+        return range(
+            bisect.bisect_left(boundaries[d], roi.begin[d]),
+            bisect.bisect_left(boundaries[d], roi.end[d]),
+        )
+
+    remaining: Set[Tuple[int, ...]] = set()
+    for roi in rois:
+        remaining.update(itertools.product(*(cell_range(roi, d) for d in range(dims))))
+
+    boxes = []
+    for cell in sorted(remaining):
+        if cell not in remaining:
+            continue
+
+        # grow a box from this cell, starting with the last dimension
+        extent = [1] * dims
+        for d in reversed(range(dims)):
+            while cell[d] + extent[d] < len(boundaries[d]) - 1:
+                ranges = [range(c, c + e) for c, e in zip(cell, extent)]
+                ranges[d] = range(cell[d] + extent[d], cell[d] + extent[d] + 1)
+                if not all(c in remaining for c in itertools.product(*ranges)):
+                    break
+                extent[d] += 1
+
+        ranges = [range(c, c + e) for c, e in zip(cell, extent)]
+        remaining.difference_update(itertools.product(*ranges))
+
+        begin = Coordinate(boundaries[d][cell[d]] for d in range(dims))
+        end = Coordinate(boundaries[d][cell[d] + extent[d]] for d in range(dims))
+        boxes.append(Roi(begin, end - begin))
+
+    return boxes
+
+
+def _split_overlaps(rois: List[Roi]) -> List[Roi]:
+    """Split ROIs into disjoint boxes covering the same region, by subtracting
+    the boxes kept so far from each ROI."""
+
+    kept: List[Box] = []
+    for roi in rois:
+        pieces = [_to_box(roi)]
+        for other in kept:
+            pieces = [p for piece in pieces for p in _subtract(piece, other)]
+            if not pieces:
+                break
+        kept.extend(pieces)
+
+    return [_to_roi(box) for box in kept]
+
+
+def _subtract(a: Box, b: Box) -> List[Box]:
+    """Get disjoint boxes covering ``a`` without ``b``."""
+
+    (begin_a, end_a), (begin_b, end_b) = a, b
+    if any(
+        bb >= ea or ba >= eb for ba, ea, bb, eb in zip(begin_a, end_a, begin_b, end_b)
+    ):
+        return [a]
+
+    pieces = []
+    begin, end = list(begin_a), list(end_a)
+    for d in range(len(begin)):
+        if begin[d] < begin_b[d]:
+            piece_end = list(end)
+            piece_end[d] = begin_b[d]
+            pieces.append((tuple(begin), tuple(piece_end)))
+            begin[d] = begin_b[d]
+        if end[d] > end_b[d]:
+            piece_begin = list(begin)
+            piece_begin[d] = end_b[d]
+            pieces.append((tuple(piece_begin), tuple(end)))
+            end[d] = end_b[d]
+
+    return pieces
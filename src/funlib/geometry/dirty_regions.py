@@ -0,0 +1,168 @@
+import itertools
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from .coalescing import _ExactMerger
+from .coordinate import Coordinate
+from .roi import Roi
+from .tiling import Tiling
+
+Context = Union[Iterable[int], int]
+
+
+class DirtyRegions:
+    """A set of modified regions, represented as a list of :class:`Roi`.
+
+    Added ROIs are merged with the tracked ones whenever this does not change
+    the covered region, i.e., if one contains the other or if their union is
+    exactly their bounding box. Use :meth:`dilate` or :meth:`propagate` to get
+    the regions that have to be recomputed by one or a chain of blockwise
+    operators, and :meth:`blocks` to find the affected blocks of a
+    :class:`Tiling`::
+
+        dirty = DirtyRegions()
+        dirty.add(Roi((10, 10), (5, 5)))
+        dirty.add(Roi((15, 10), (5, 5)))   # merged into Roi((10, 10), (10, 5))
+
+        # two operators, each reading 2 voxels of context
+        affected = dirty.propagate([2, 2])
+        affected.blocks(tiling)             # block indices to recompute
+
+    An added ROI is only compared to the tracked regions it can overlap or
+    touch along the first dimension, such that regions can be added in time
+    roughly proportional to the change. No operation depends on the size of
+    the volume.
+
+    Args:
+
+        rois (iterable of :class:`Roi`, optional):
+
+            Initial dirty regions.
+    """
+
+    def __init__(self, rois: Iterable[Roi] = ()):
+        self.__regions = _ExactMerger()
+        self.__dims: Optional[int] = None
+        for roi in rois:
+            self.add(roi)
+
+    @property
+    def rois(self) -> List[Roi]:
+        return self.__regions.rois()
+
+    @property
+    def empty(self) -> bool:
+        return len(self.__regions) == 0
+
+    def add(self, roi: Roi) -> None:
+        """Mark ``roi`` as dirty."""
+
+        if roi.empty:
+            return
+
+        if self.empty:
+            self.__dims = roi.dims
+        assert roi.dims == self.__dims, (
+            "dimension of dirty region does not match tracked regions"
+        )
+
+        self.__regions.add(roi)
+
+    def update(self, rois: Iterable[Roi]) -> None:
+        """Mark all of ``rois`` as dirty."""
+
+        for roi in rois:
+            self.add(roi)
+
+    def clear(self) -> None:
+        self.__regions.clear()
+
+    def bounding_roi(self) -> Optional[Roi]:
+        """Get the smallest ROI containing all dirty regions, or ``None`` if
+        there are none."""
+
+        rois = self.rois
+        if not rois:
+            return None
+
+        bounding_roi = rois[0]
+        for roi in rois[1:]:
+            bounding_roi = bounding_roi.union(roi)
+        return bounding_roi
+
+    def dilate(
+        self, context_neg: Context = 0, context_pos: Context = 0
+    ) -> "DirtyRegions":
+        """Get the regions affected by an operator that reads context around
+        what it writes.
+
+        The operator is assumed to compute an output ROI from the input ROI
+        ``output_roi.grow(context_neg, context_pos)``. A change of the input at
+        a position therefore affects outputs up to ``context_pos`` before and
+        ``context_neg`` after it.
+
+        Args:
+
+            context_neg (:class:`Coordinate` or ``int``):
+
+                The context the operator reads in the negative direction.
+
+            context_pos (:class:`Coordinate` or ``int``):
+
+                The context the operator reads in the positive direction.
+        """
+
+        return DirtyRegions(roi.grow(context_pos, context_neg) for roi in self.rois)
+
+    def propagate(self, contexts: Iterable[Tuple[Context, Context]]) -> "DirtyRegions":
+        """Get the regions affected by a chain of operators.
+
+        Args:
+
+            contexts (iterable of ``tuple``):
+
+                The context of each operator in the order they are applied, as
+                tuples ``(context_neg, context_pos)`` as in :meth:`dilate`.
+        """
+
+        dirty = self
+        for context_neg, context_pos in contexts:
+            dirty = dirty.dilate(context_neg, context_pos)
+
+        return dirty
+
+    def clip(self, roi: Roi) -> "DirtyRegions":
+        """Restrict the dirty regions to ``roi``."""
+
+        return DirtyRegions(r.intersect(roi) for r in self.rois)
+
+    def blocks(self, tiling: Tiling) -> List[Coordinate]:
+        """Get the indices of all blocks of ``tiling`` whose write ROI
+        intersects a dirty region, in C order."""
+
+        indices = set()
+        for roi in self.rois:
+            roi = roi.intersect(tiling.total_roi)
+            if roi.empty:
+                continue
+            first = tiling.block_index(roi.begin)
+            last = tiling.block_index(roi.end - 1)
+            indices.update(
+                itertools.product(*(range(f, e + 1) for f, e in zip(first, last)))
+            )
+
+        return [Coordinate(index) for index in sorted(indices)]
+
+    def block_rois(self, tiling: Tiling) -> List[Roi]:
+        """Get the write ROIs of all blocks of ``tiling`` that intersect a
+        dirty region, in C order of their indices."""
+
+        return [tiling.write_roi(index) for index in self.blocks(tiling)]
+
+    def __iter__(self) -> Iterator[Roi]:
+        return iter(self.rois)
+
+    def __len__(self) -> int:
+        return len(self.__regions)
+
+    def __repr__(self) -> str:
+        return f"DirtyRegions({self.rois!r})"
@@ -0,0 +1,313 @@
+import heapq
+import math
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence, Tuple, Union
+
+from ._numpy import import_numpy
+from .roi import Roi
+
+if TYPE_CHECKING:
+    import numpy as np
+
+Query = Union[Roi, Iterable[Optional[int]]]
+
+
+def distance(a: Roi, b: Query, norm: float = 2) -> float:
+    """Get the distance between a ROI and another ROI or a point.
+
+    ROIs are treated as closed boxes from ``begin`` to ``end``, i.e., the
+    distance is the length of the shortest line between any two points of
+    both boxes. Overlapping and touching ROIs have a distance of zero.
+    Unbounded dimensions do not contribute to the distance. The distance to
+    an empty ROI is infinite.
+
+    Args:
+
+        a (:class:`Roi`):
+
+            The first ROI.
+
+        b (:class:`Roi`, :class:`Coordinate`, or ``tuple``):
+
+            The second ROI or a point.
+
+        norm (``1``, ``2``, or ``math.inf``, optional):
+
+            The norm to use, i.e., the Manhattan, Euclidean, or Chebyshev
+            distance. Defaults to 2.
+    """
+
+    _check_norm(norm)
+
+    if a.empty or (isinstance(b, Roi) and b.empty):
+        return math.inf
+
+    if isinstance(b, Roi):
+        b_begin, b_end = tuple(b.begin), tuple(b.end)
+    else:
+        b_begin = b_end = tuple(b)
+
+    assert len(b_begin) == a.dims, "dimensions do not match"
+
+    gaps = []
+    for b1, e1, b2, e2 in zip(a.begin, a.end, b_begin, b_end):
+        gap = 0
+        if b1 is not None and e2 is not None:
+            gap = max(gap, b1 - e2)
+        if b2 is not None and e1 is not None:
+            gap = max(gap, b2 - e1)
+        gaps.append(gap)
+
+    if norm == 1:
+        return sum(gaps)
+    if norm == 2:
+        return math.sqrt(sum(g * g for g in gaps))
+    return max(gaps, default=0)
+
+
+class RoiIndex:
+    """A spatial index over a collection of ROIs for distance and nearest
+    neighbour queries.
+
+    The ROIs are packed into a bounding volume hierarchy (sort-tile-recursive
+    R-tree), such that :meth:`nearest` only visits the nodes that can contain
+    one of the nearest ROIs. :meth:`distances` and :meth:`distances_many`
+    compute the distances from one or many queries to all ROIs at once::
+
+        index = RoiIndex(block_rois)
+        index.nearest((100, 250, 12), k=3)  # [(i, distance), ...]
+        index.distances(Roi((0, 0, 0), (10, 10, 10)), norm=1)  # numpy array
+
+    Distances are computed as in :func:`distance`. Empty ROIs are never
+    returned as neighbours.
+
+    Requires ``numpy``.
+
+    Args:
+
+        rois (sequence of :class:`Roi`):
+
+            The ROIs to index. Results refer to ROIs by their position in this
+            sequence.
+
+        leaf_size (``int``, optional):
+
+            The number of children per node of the hierarchy.
+    """
+
+    def __init__(self, rois: Sequence[Roi], leaf_size: int = 16):
+        np = import_numpy("RoiIndex")
+
+        assert leaf_size > 1, "leaf size has to be at least 2"
+
+        self.rois = rois
+        self.leaf_size = leaf_size
+
+        self.__begins, self.__ends = _to_arrays(np, rois)
+        if len(rois) > 0:
+            self.dims = self.__begins.shape[1]
+        else:
+            self.dims = 0
+
+        # empty ROIs are not part of the hierarchy
+        valid = np.flatnonzero(~np.isnan(self.__begins).any(axis=1))
+        order = valid[self.__str_order(np, valid)]
+
+        # level 0 are the ROIs themselves, in spatially coherent order
+        self.__levels: List[Tuple["np.ndarray", "np.ndarray", "np.ndarray"]] = [
+            (self.__begins[order], self.__ends[order], order)
+        ]
+        while len(self.__levels[-1][0]) > 1:
+            begins, ends, _ = self.__levels[-1]
+            starts = np.arange(0, len(begins), leaf_size)
+            self.__levels.append(
+                (
+                    np.minimum.reduceat(begins, starts, axis=0),
+                    np.maximum.reduceat(ends, starts, axis=0),
+                    starts,
+                )
+            )
+
+    def __len__(self) -> int:
+        return len(self.rois)
+
+    def distances(self, query: Query, norm: float = 2) -> "np.ndarray":
+        """Get the distances of all ROIs to ``query`` (a ROI or a point) as
+        an array of ``float64``."""
+
+        return self.distances_many([query], norm)[0]
+
+    def distances_many(self, queries: Iterable[Query], norm: float = 2) -> "np.ndarray":
+        """Get the distances of all ROIs to each of ``queries`` (ROIs or
+        points) at once, as an array of ``float64`` of shape
+        ``(num_queries, num_rois)``.
+
+        This computes all distances without pruning, use :meth:`nearest` to
+        find only the closest ROIs of a large index.
+        """
+
+        np = import_numpy("RoiIndex")
+        _check_norm(norm)
+
+        queries = list(queries)
+        if len(self.rois) == 0:
+            return np.zeros((len(queries), 0))
+
+        bounds = [self.__query(np, query) for query in queries]
+        query_begins = np.array([b for b, _ in bounds]).reshape(-1, 1, self.dims)
+        query_ends = np.array([e for _, e in bounds]).reshape(-1, 1, self.dims)
+
+        distances = _distances(
+            np,
+            self.__begins[None, :, :],
+            self.__ends[None, :, :],
+            query_begins,
+            query_ends,
+            norm,
+        )
+        distances[np.isnan(distances)] = np.inf
+        return distances
+
+    def nearest(
+        self, query: Query, k: int = 1, norm: float = 2
+    ) -> List[Tuple[int, float]]:
+        """Get the ``k`` ROIs closest to ``query`` (a ROI or a point).
+
+        Returns a list of ``(index, distance)`` tuples, sorted by increasing
+        distance. Fewer than ``k`` tuples are returned if there are not
+        enough non-empty ROIs.
+        """
+
+        np = import_numpy("RoiIndex")
+        _check_norm(norm)
+
+        if len(self.__levels[0][0]) == 0 or k <= 0:
+            return []
+
+        query_begin, query_end = self.__query(np, query)
+        if np.isnan(query_begin).any():
+            # empty query ROI
+            return []
+
+        top = len(self.__levels) - 1
+        begins, ends, _ = self.__levels[top]
+        heap = [
+            (float(d), top, int(i))
+            for i, d in enumerate(
+                _distances(np, begins, ends, query_begin, query_end, norm)
+            )
+        ]
+        heapq.heapify(heap)
+
+        results: List[Tuple[int, float]] = []
+        while heap and len(results) < k:
+            dist, level, i = heapq.heappop(heap)
+
+            if level == 0:
+                results.append((int(self.__levels[0][2][i]), dist))
+                continue
+
+            _, _, starts = self.__levels[level]
+            start = starts[i]
+            stop = starts[i + 1] if i + 1 < len(starts) else None
+            begins, ends, _ = self.__levels[level - 1]
+            child_distances = _distances(
+                np, begins[start:stop], ends[start:stop], query_begin, query_end, norm
+            )
+            for j, d in enumerate(child_distances.tolist()):
+                heapq.heappush(heap, (d, level - 1, int(start + j)))
+
+        return results
+
+    def nearest_many(
+        self, queries: Iterable[Query], k: int = 1, norm: float = 2
+    ) -> List[List[Tuple[int, float]]]:
+        """Get the ``k`` nearest ROIs for each of ``queries``, see
+        :meth:`nearest`.
+
+        Each query traverses the hierarchy on its own, i.e., runtime is linear
+        in the number of queries. To compute the distances of many queries to
+        all ROIs in a single vectorized call, use :meth:`distances_many`.
+        """
+
+        return [self.nearest(query, k, norm) for query in queries]
+
+    def __query(self, np, query: Query):
+        if isinstance(query, Roi):
+            begins, ends = _to_arrays(np, [query])
+            return begins[0], ends[0]
+
+        point = np.array([np.nan if p is None else p for p in query], dtype=np.float64)
+        assert len(point) == self.dims, "dimension of query does not match"
+        # a missing coordinate matches everything
+        return (
+            np.where(np.isnan(point), -np.inf, point),
+            np.where(np.isnan(point), np.inf, point),
+        )
+
+    def __str_order(self, np, indices: "np.ndarray") -> "np.ndarray":
+        """Sort-tile-recursive order of the ROIs with the given indices."""
+
+        centers = (
+            np.nan_to_num(self.__begins[indices], neginf=-1e300)
+            + np.nan_to_num(self.__ends[indices], posinf=1e300)
+        ) / 2
+
+        def order(subset, dim):
+            subset = subset[np.argsort(centers[subset, dim], kind="stable")]
+            if dim == self.dims - 1 or len(subset) <= self.leaf_size:
+                return subset
+            num_leaves = -(-len(subset) // self.leaf_size)
+            num_slabs = math.ceil(num_leaves ** (1 / (self.dims - dim)))
+            slab_size = -(-num_leaves // num_slabs) * self.leaf_size
+            return np.concatenate(
+                [
+                    order(subset[s : s + slab_size], dim + 1)
+                    for s in range(0, len(subset), slab_size)
+                ]
+            )
+
+        if len(indices) == 0:
+            return np.zeros(0, dtype=np.int64)
+        return order(np.arange(len(indices)), 0)
+
+
+def _check_norm(norm: float) -> None:
+    if norm not in (1, 2, math.inf):
+        raise RuntimeError("Unknown norm %s, use 1, 2, or math.inf" % norm)
+
+
+def _to_arrays(np, rois: Sequence[Roi]):
+    """Convert ROIs to arrays of begins and ends, with infinite values for
+    unbounded dimensions and NaN for empty ROIs."""
+
+    if len(rois) == 0:
+        return np.zeros((0, 0)), np.zeros((0, 0))
+
+    begins = np.array(
+        [
+            [-np.inf if b is None else b for b in roi.begin]
+            if not roi.empty
+            else [np.nan] * roi.dims
+            for roi in rois
+        ],
+        dtype=np.float64,
+    )
+    ends = np.array(
+        [
+            [np.inf if e is None else e for e in roi.end]
+            if not roi.empty
+            else [np.nan] * roi.dims
+            for roi in rois
+        ],
+        dtype=np.float64,
+    )
+    return begins, ends
+
+
+def _distances(np, begins, ends, query_begin, query_end, norm: float):
+    gaps = np.maximum(np.maximum(begins - query_end, query_begin - ends), 0)
+    if norm == 1:
+        return gaps.sum(axis=-1)
+    if norm == 2:
+        return np.sqrt((gaps * gaps).sum(axis=-1))
+    return gaps.max(axis=-1, initial=0)
@@ -0,0 +1,146 @@
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+from .coordinate import Coordinate
+from .roi import Roi
+
+
+class FrozenRoi(Roi):
+    """An immutable :class:`Roi`.
+
+    Setting the ``offset`` or ``shape`` of a ``FrozenRoi`` raises an
+    ``AttributeError``, it can not be thawed, and does not accept new
+    attributes. All operations that return a ROI return a ``FrozenRoi`` as
+    well. Since :class:`Coordinate` is an immutable
+    ``tuple``, a ``FrozenRoi`` can never change after construction and can be
+    shared between threads without copying it (``copy()`` returns the same
+    object). Unlike :class:`Roi`, it is hashable::
+
+        roi = FrozenRoi((0, 0), (10, 10))
+        roi.offset = (1, 1)   # AttributeError
+        roi.grow(1, 1)        # FrozenRoi((-1, -1), (12, 12))
+        roi == Roi((0, 0), (10, 10))  # True
+
+    Args:
+
+        offset (array-like of ``int``):
+
+            The offset of the ROI, see :class:`Roi`.
+
+        shape (array-like of ``int``):
+
+            The shape of the ROI, see :class:`Roi`.
+    """
+
+    def __init__(self, offset: Iterable[Optional[int]], shape: Iterable[Optional[int]]):
+        offset = Coordinate(offset)
+        shape = Coordinate(shape)
+
+        assert offset.dims == shape.dims, (
+            "offset dimension %d != shape dimension %d"
+            % (
+                offset.dims,
+                shape.dims,
+            )
+        )
+
+        offset = Coordinate(o if s is not None else None for o, s in zip(offset, shape))
+
+        # same attributes as Roi, such that equality between both holds
+        object.__setattr__(self, "_Roi__offset", offset)
+        object.__setattr__(self, "_Roi__shape", shape)
+        object.__setattr__(self, "_Freezable__isfrozen", True)
+
+    @classmethod
+    def from_roi(cls, roi: Roi) -> "FrozenRoi":
+        """Get an immutable version of ``roi``."""
+
+        if isinstance(roi, FrozenRoi):
+            return roi
+        return cls(roi.offset, roi.shape)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("%r is immutable" % self)
+
+    def __delattr__(self, key):
+        raise AttributeError("%r is immutable" % self)
+
+    def thaw(self):
+        raise TypeError("%r is immutable and can not be thawed" % self)
+
+    def freeze(self):
+        pass
+
+    def copy(self) -> "FrozenRoi":
+        """Immutable ROIs are never copied, this returns ``self``."""
+        return self
+
+    def __copy__(self) -> "FrozenRoi":
+        return self
+
+    def __deepcopy__(self, memo) -> "FrozenRoi":
+        return self
+
+    def squeeze(self, dim: int = 0) -> "FrozenRoi":
+        return FrozenRoi.from_roi(super().squeeze(dim))
+
+    def intersect(self, other: Roi) -> "FrozenRoi":
+        return FrozenRoi.from_roi(super().intersect(other))
+
+    def union(self, other: Roi) -> "FrozenRoi":
+        return FrozenRoi.from_roi(super().union(other))
+
+    def shift(self, by: Union[Coordinate, int]) -> "FrozenRoi":
+        return FrozenRoi(self.offset + by, self.shape)
+
+    def snap_to_grid(
+        self, voxel_size: Iterable[Optional[int]], mode: str = "grow"
+    ) -> "FrozenRoi":
+        return FrozenRoi.from_roi(super().snap_to_grid(voxel_size, mode))
+
+    def grow(
+        self,
+        amount_neg: Union[Iterable[Optional[int]], int] = 0,
+        amount_pos: Union[Iterable[Optional[int]], int] = 0,
+    ) -> "FrozenRoi":
+        return FrozenRoi.from_roi(super().grow(amount_neg, amount_pos))
+
+    def subdivide(
+        self,
+        predicate: Optional[Callable[[Roi], bool]] = None,
+        cost: Optional[Callable[[Roi], float]] = None,
+        max_cost: float = 0,
+        voxel_size: Optional[Iterable[int]] = None,
+        max_depth: Optional[int] = None,
+        min_shape: Optional[Union[Iterable[int], int]] = None,
+    ) -> Iterator["FrozenRoi"]:
+        for roi in super().subdivide(
+            predicate, cost, max_cost, voxel_size, max_depth, min_shape
+        ):
+            yield FrozenRoi.from_roi(roi)
+
+    def __add__(self, other: Union[Coordinate, int]) -> "FrozenRoi":
+        return FrozenRoi.from_roi(super().__add__(other))
+
+    def __sub__(self, other: Union[Coordinate, int]) -> "FrozenRoi":
+        return FrozenRoi.from_roi(super().__sub__(other))
+
+    def __mul__(self, other: Union[Coordinate, int]) -> "FrozenRoi":
+        return FrozenRoi.from_roi(super().__mul__(other))
+
+    def __div__(self, other: Union[Coordinate, int]) -> "FrozenRoi":
+        return FrozenRoi.from_roi(super().__div__(other))
+
+    def __truediv__(self, other: Union[Coordinate, int]) -> "FrozenRoi":
+        return FrozenRoi.from_roi(super().__truediv__(other))
+
+    def __floordiv__(self, other: Union[Coordinate, int]) -> "FrozenRoi":
+        return FrozenRoi.from_roi(super().__floordiv__(other))
+
+    def __mod__(self, other: Union[Coordinate, int]) -> "FrozenRoi":
+        return FrozenRoi.from_roi(super().__mod__(other))
+
+    def __hash__(self) -> int:
+        return hash((self.offset, self.shape))
+
+    def __repr__(self) -> str:
+        return f"FrozenRoi({self.offset}, {self.shape})"
@@ -0,0 +1,121 @@
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Iterable
+
+from .coordinate import Coordinate
+
+InternInfo = namedtuple("InternInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class CoordinateInterner:
+    """A bounded table of canonical :class:`Coordinate` instances.
+
+    :meth:`intern` returns the same :class:`Coordinate` object for all equal
+    coordinates, such that long-lived references to frequently repeated
+    values (voxel sizes, block shapes, zero offsets, ...) share one instance.
+    The table keeps the ``maxsize`` most recently used coordinates. Tuples of
+    ``int`` are looked up without creating a new :class:`Coordinate`::
+
+        interner = CoordinateInterner(maxsize=256)
+        a = interner.intern(4, 4, 40)
+        b = interner.intern((4, 4, 40))
+        assert a is b
+        interner.cache_info()  # InternInfo(hits=1, misses=1, maxsize=256, currsize=1)
+
+    Interning is opt-in: :class:`Coordinate` itself is not affected. It is
+    safe to use an interner from multiple threads.
+
+    Args:
+
+        maxsize (``int``, optional):
+
+            The maximal number of coordinates to keep. Defaults to 1024.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        assert maxsize > 0, "maxsize has to be positive"
+
+        self.maxsize = maxsize
+        self.__table: "OrderedDict[tuple, Coordinate]" = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def intern(self, *array_like) -> Coordinate:
+        """Get the canonical :class:`Coordinate` for the given values, which
+        are interpreted as by the :class:`Coordinate` constructor."""
+
+        if len(array_like) == 1 and isinstance(array_like[0], Iterable):
+            key = array_like[0]
+            if not isinstance(key, tuple):
+                key = tuple(key)
+        else:
+            key = array_like
+
+        with self.__lock:
+            coordinate = self.__lookup(key)
+            if coordinate is not None:
+                return coordinate
+
+        # not a tuple of plain ints, or seen for the first time
+        coordinate = Coordinate(key)
+
+        with self.__lock:
+            canonical = self.__lookup(coordinate)
+            if canonical is not None:
+                return canonical
+
+            self.__misses += 1
+            self.__table[coordinate] = coordinate
+            if len(self.__table) > self.maxsize:
+                self.__table.popitem(last=False)
+
+        return coordinate
+
+    def cache_info(self) -> InternInfo:
+        """Get the number of hits and misses and the size of the table."""
+
+        with self.__lock:
+            return InternInfo(
+                self.__hits, self.__misses, self.maxsize, len(self.__table)
+            )
+
+    def clear(self) -> None:
+        """Remove all coordinates from the table and reset the statistics."""
+
+        with self.__lock:
+            self.__table.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__table)
+
+    def __lookup(self, key: tuple):
+        try:
+            coordinate = self.__table.get(key)
+        except TypeError:
+            # unhashable entries, let Coordinate() handle them
+            return None
+
+        if coordinate is not None:
+            self.__table.move_to_end(coordinate)
+            self.__hits += 1
+
+        return coordinate
+
+
+_default_interner = CoordinateInterner()
+
+
+def intern_coordinate(*array_like) -> Coordinate:
+    """Get the canonical :class:`Coordinate` for the given values from the
+    default :class:`CoordinateInterner` (see :func:`get_default_interner`)."""
+
+    return _default_interner.intern(*array_like)
+
+
+def get_default_interner() -> CoordinateInterner:
+    """Get the interner used by :func:`intern_coordinate`."""
+
+    return _default_interner
@@ -0,0 +1,246 @@
+import heapq
+import itertools
+import math
+import os
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .roi import Roi
+
+Item = Tuple[Any, Roi]
+
+
+def spatial_join(
+    rois_a: Iterable[Union[Item, Roi]],
+    rois_b: Iterable[Union[Item, Roi]],
+    axis: int = 0,
+) -> Iterator[Tuple[Any, Any, Roi]]:
+    """Find all intersecting pairs between two streams of ROIs.
+
+    Both streams have to be sorted by the begin of their ROIs along ``axis``
+    (see :func:`sort_rois`). They are consumed lazily in a single sweep along
+    this axis, keeping only the ROIs that overlap the current sweep position
+    in memory. This makes it possible to join collections that do not fit
+    into memory, e.g., streamed from disk with :func:`read_rois`::
+
+        pairs = spatial_join(read_rois("predictions.txt"), read_rois("labels.txt"))
+        for prediction_id, label_id, intersection in pairs:
+            ...
+
+    Runtime is linear in the number of ROIs and pairs, plus the number of
+    candidates that overlap along ``axis`` only. Memory is bounded by the
+    number of ROIs that overlap the sweep position along ``axis``. Once one
+    stream is exhausted, the other one is only consumed as long as it can
+    still intersect. Empty ROIs are skipped.
+
+    Args:
+
+        rois_a, rois_b (iterables of :class:`Roi` or ``(id, Roi)``):
+
+            The ROIs to join, optionally with an ID each. If no IDs are given,
+            the position in the stream is used.
+
+        axis (``int``, optional):
+
+            The dimension the streams are sorted by. Defaults to 0.
+
+    Yields:
+
+        Tuples ``(id_a, id_b, intersection)`` for each pair of ROIs that
+        intersect, in the order they are found.
+    """
+
+    streams = [_sweep_events(rois_a, 0, axis), _sweep_events(rois_b, 1, axis)]
+    heads = [next(stream, None) for stream in streams]
+
+    # per side: active ROIs by insertion counter, and a heap of their ends
+    active: List[dict] = [{}, {}]
+    ends: List[list] = [[], []]
+    counter = itertools.count()
+    previous = [-math.inf, -math.inf]
+
+    while heads[0] is not None or heads[1] is not None:
+        if heads[1] is None or (heads[0] is not None and heads[0][0] <= heads[1][0]):
+            side = 0
+        else:
+            side = 1
+        other = 1 - side
+
+        event = heads[side]
+        assert event is not None
+        begin, _, item_id, roi = event
+        heads[side] = next(streams[side], None)
+
+        if begin < previous[side]:
+            raise RuntimeError(
+                "ROIs are not sorted along axis %d: %s begins before %s"
+                % (axis, roi, previous[side])
+            )
+        previous[side] = begin
+
+        # remove ROIs that end before this one begins, they can not intersect
+        # any of the following ROIs
+        for s in (side, other):
+            while ends[s] and ends[s][0][0] <= begin:
+                _, key = heapq.heappop(ends[s])
+                del active[s][key]
+
+        for other_id, other_roi in active[other].values():
+            if roi.intersects(other_roi):
+                if side == 0:
+                    yield item_id, other_id, roi.intersect(other_roi)
+                else:
+                    yield other_id, item_id, other_roi.intersect(roi)
+
+        if heads[other] is None:
+            # the other stream is exhausted, no need to remember this ROI
+            if not active[other]:
+                return
+            continue
+
+        key = next(counter)
+        active[side][key] = (item_id, roi)
+        heapq.heappush(ends[side], (_end(roi, axis), key))
+
+
+def write_rois(path: str, rois: Iterable[Union[Item, Roi]]) -> int:
+    """Write ROIs to a text file, one ROI per line, to be read with
+    :func:`read_rois`.
+
+    Each line contains an ID, followed by the offset and shape of the ROI,
+    separated by whitespace. IDs can not contain whitespace.
+
+    Args:
+
+        path (``str``):
+
+            The file to write to.
+
+        rois (iterable of :class:`Roi` or ``(id, Roi)``):
+
+            The ROIs to write. If no IDs are given, the position in the
+            iterable is used.
+
+    Returns:
+
+        The number of ROIs written.
+    """
+
+    num_rois = 0
+    with open(path, "w") as f:
+        for item_id, roi in _items(rois):
+            f.write(_format(item_id, roi))
+            num_rois += 1
+    return num_rois
+
+
+def read_rois(path: str) -> Iterator[Tuple[str, Roi]]:
+    """Lazily read ``(id, Roi)`` tuples from a file written by
+    :func:`write_rois`. IDs are returned as strings."""
+
+    with open(path) as f:
+        for line in f:
+            yield _parse(line)
+
+
+def sort_rois(
+    path: str,
+    sorted_path: str,
+    axis: int = 0,
+    batch_size: int = 1000000,
+    tmp_dir: Optional[str] = None,
+) -> None:
+    """Sort a file of ROIs by their begin along ``axis``, using at most
+    ``batch_size`` ROIs in memory at a time.
+
+    Batches are sorted in memory and written to temporary files, which are
+    then merged into ``sorted_path``.
+
+    Args:
+
+        path (``str``):
+
+            The file written by :func:`write_rois` to sort.
+
+        sorted_path (``str``):
+
+            The file to write the sorted ROIs to.
+
+        axis (``int``, optional):
+
+            The dimension to sort by. Defaults to 0.
+
+        batch_size (``int``, optional):
+
+            The number of ROIs to sort in memory at once.
+
+        tmp_dir (``str``, optional):
+
+            Where to store the sorted batches. Defaults to the system's
+            temporary directory.
+    """
+
+    # not imported at module level to keep the import of this package fast
+    import tempfile
+
+    assert batch_size > 0, "batch size has to be positive"
+
+    def key(item):
+        return _begin(item[1], axis)
+
+    batch_paths = []
+    try:
+        items = read_rois(path)
+        while True:
+            batch = sorted(itertools.islice(items, batch_size), key=key)
+            if not batch:
+                break
+            fd, batch_path = tempfile.mkstemp(suffix=".rois", dir=tmp_dir)
+            os.close(fd)
+            batch_paths.append(batch_path)
+            write_rois(batch_path, batch)
+
+        write_rois(
+            sorted_path,
+            heapq.merge(*(read_rois(p) for p in batch_paths), key=key),
+        )
+    finally:
+        for batch_path in batch_paths:
+            os.remove(batch_path)
+
+
+def _sweep_events(
+    rois: Iterable[Union[Item, Roi]], side: int, axis: int
+) -> Iterator[Tuple[float, int, Any, Roi]]:
+    for item_id, roi in _items(rois):
+        if not roi.empty:
+            yield _begin(roi, axis), side, item_id, roi
+
+
+def _items(rois: Iterable[Union[Item, Roi]]) -> Iterator[Item]:
+    for i, item in enumerate(rois):
+        if isinstance(item, Roi):
+            yield i, item
+        else:
+            yield item
+
+
+def _begin(roi: Roi, axis: int) -> float:
+    begin = roi.begin[axis]
+    return -math.inf if begin is None else begin
+
+
+def _end(roi: Roi, axis: int) -> float:
+    end = roi.end[axis]
+    return math.inf if end is None else end
+
+
+def _format(item_id: Any, roi: Roi) -> str:
+    values = [str(item_id)] + [str(v) for v in roi.offset] + [str(v) for v in roi.shape]
+    return " ".join(values) + "\n"
+
+
+def _parse(line: str) -> Tuple[str, Roi]:
+    values = line.split()
+    dims = (len(values) - 1) // 2
+    coordinates = [None if v == "None" else int(v) for v in values[1:]]
+    return values[0], Roi(coordinates[:dims], coordinates[dims:])
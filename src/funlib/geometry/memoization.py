@@ -0,0 +1,174 @@
+import contextlib
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Any, Generator, Optional
+
+from . import _memoize
+from .frozen_roi import FrozenRoi
+from .roi import Roi
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class RoiCache:
+    """A bounded LRU cache for the results of pure :class:`Roi` operations.
+
+    While a cache is active (see :func:`memoize_roi_operations` and
+    :func:`enable_roi_memoization`), the results of :meth:`Roi.snap_to_grid`,
+    :meth:`Roi.intersect`, and :meth:`Roi.grow` are looked up by the ROI and
+    the arguments of the call, and only computed on a miss::
+
+        cache = RoiCache(maxsize=4096)
+        with memoize_roi_operations(cache):
+            for level_voxel_size in voxel_sizes:
+                request.snap_to_grid(level_voxel_size)
+        cache.cache_info()  # CacheInfo(hits=..., misses=..., ...)
+
+    Results are stored as immutable :class:`FrozenRoi`, but each call returns
+    a new :class:`Roi`, such that enabling memoization does not change the
+    behaviour of code that modifies the returned ROIs. A cache can be used
+    from multiple threads.
+
+    Args:
+
+        maxsize (``int``, optional):
+
+            The maximal number of results to keep. Defaults to 4096.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        assert maxsize > 0, "maxsize has to be positive"
+
+        self.maxsize = maxsize
+        self.__results: "OrderedDict[tuple, FrozenRoi]" = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def call(self, method, roi: Roi, args: tuple, kwargs: dict) -> Any:
+        """Get the result of ``method(roi, *args, **kwargs)``, from the cache
+        if possible, as a new :class:`Roi`."""
+
+        try:
+            key = (
+                method.__name__,
+                roi.offset,
+                roi.shape,
+                _key(args),
+                _key(tuple(sorted(kwargs.items()))),
+            )
+            hash(key)
+        except TypeError:
+            # arguments can not be used as key, don't cache
+            return method(roi, *args, **kwargs)
+
+        with self.__lock:
+            result = self.__results.get(key)
+            if result is not None:
+                self.__results.move_to_end(key)
+                self.__hits += 1
+                return Roi(result.offset, result.shape)
+
+        result = FrozenRoi.from_roi(method(roi, *args, **kwargs))
+
+        with self.__lock:
+            self.__misses += 1
+            self.__results[key] = result
+            if len(self.__results) > self.maxsize:
+                self.__results.popitem(last=False)
+
+        return Roi(result.offset, result.shape)
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of calls answered from the cache."""
+
+        calls = self.__hits + self.__misses
+        return self.__hits / calls if calls > 0 else 0.0
+
+    def cache_info(self) -> CacheInfo:
+        """Get the number of hits and misses and the size of the cache."""
+
+        with self.__lock:
+            return CacheInfo(
+                self.__hits, self.__misses, self.maxsize, len(self.__results)
+            )
+
+    def clear(self) -> None:
+        """Remove all results from the cache and reset the statistics."""
+
+        with self.__lock:
+            self.__results.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__results)
+
+
+@contextlib.contextmanager
+def memoize_roi_operations(
+    cache: Optional[RoiCache] = None,
+) -> Generator[RoiCache, None, None]:
+    """Memoize pure :class:`Roi` operations within a ``with`` block.
+
+    The cache is only active in the current thread (or ``asyncio`` task) and
+    takes precedence over a cache enabled with :func:`enable_roi_memoization`.
+
+    Args:
+
+        cache (:class:`RoiCache`, optional):
+
+            The cache to use. If not given, a new one is created.
+    """
+
+    if cache is None:
+        cache = RoiCache()
+
+    token = _memoize.scoped_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _memoize.scoped_cache.reset(token)
+
+
+def enable_roi_memoization(cache: Optional[RoiCache] = None) -> RoiCache:
+    """Memoize pure :class:`Roi` operations in all threads, until
+    :func:`disable_roi_memoization` is called.
+
+    Args:
+
+        cache (:class:`RoiCache`, optional):
+
+            The cache to use. If not given, a new one is created.
+    """
+
+    if cache is None:
+        cache = RoiCache()
+    _memoize.global_cache = cache
+    return cache
+
+
+def disable_roi_memoization() -> None:
+    """Stop memoizing :class:`Roi` operations globally."""
+
+    _memoize.global_cache = None
+
+
+def get_roi_cache() -> Optional[RoiCache]:
+    """Get the cache used for :class:`Roi` operations in the current context,
+    or ``None`` if memoization is not active."""
+
+    return _memoize.active_cache()
+
+
+def _key(value: Any) -> Any:
+    """Convert arguments into a hashable key."""
+
+    if isinstance(value, Roi):
+        return ("Roi", value.offset, value.shape)
+    if isinstance(value, (tuple, list)):
+        return tuple(_key(v) for v in value)
+    if hasattr(value, "__array__"):
+        return tuple(value.tolist())
+    return value
@@ -0,0 +1,227 @@
+import itertools
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional
+
+from ._numpy import import_numpy
+from .coordinate import Coordinate
+from .roi import Roi
+from .tiling import Tiling
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class OccupancyGrid:
+    """A coarse grid that records where a volume contains data, to skip empty
+    regions without reading them.
+
+    The grid consists of cells of ``voxel_size`` starting at
+    ``total_roi.begin``, each holding the number of non-empty voxels (or a
+    boolean) of the cell. A summed-area table over the cells answers queries
+    for any ROI in constant time, independent of its size::
+
+        grid = OccupancyGrid(total_roi, (64, 64, 64), counts=downsampled_mask)
+        grid.occupied(Roi((0, 0, 0), (512, 512, 512)))  # False if background
+        for index in grid.occupied_blocks(tiling):
+            process(tiling.write_roi(index))
+
+    Queries consider all cells that overlap a ROI, i.e., a ROI that only
+    partially overlaps an occupied cell is considered occupied as well.
+
+    Requires ``numpy``.
+
+    Args:
+
+        total_roi (:class:`Roi`):
+
+            The bounded ROI covered by the grid.
+
+        voxel_size (:class:`Coordinate` or ``tuple``):
+
+            The size of a cell of the grid.
+
+        counts (array-like, optional):
+
+            The number of non-empty voxels per cell, or a boolean array. The
+            shape has to be ``total_roi.shape / voxel_size``, rounded up. If
+            not given, the grid starts empty; see :meth:`add`.
+    """
+
+    def __init__(
+        self,
+        total_roi: Roi,
+        voxel_size: Iterable[int],
+        counts: Optional[Any] = None,
+    ):
+        np = import_numpy("OccupancyGrid")
+
+        self.total_roi = total_roi
+        self.voxel_size = Coordinate(voxel_size)
+
+        assert not total_roi.unbounded, "occupancy grid needs a bounded ROI"
+        assert self.voxel_size.dims == total_roi.dims, (
+            "dimension of voxel size does not match ROI"
+        )
+        assert all(v > 0 for v in self.voxel_size), "voxel size has to be positive"
+
+        if total_roi.empty:
+            shape = (0,) * total_roi.dims
+        else:
+            shape = tuple(total_roi.shape.ceil_division(self.voxel_size))
+
+        if counts is None:
+            counts = np.zeros(shape, dtype=np.int64)
+        else:
+            counts = np.asarray(counts)
+            assert counts.shape == shape, (
+                "shape of counts %s does not match ROI %s with voxel size %s"
+                % (counts.shape, total_roi, self.voxel_size)
+            )
+            assert (counts >= 0).all(), "counts have to be non-negative"
+            counts = counts.astype(np.int64)
+
+        self.__counts = counts
+        self.__table: Optional["np.ndarray"] = None
+
+    @classmethod
+    def from_rois(
+        cls, total_roi: Roi, voxel_size: Iterable[int], rois: Iterable[Roi]
+    ) -> "OccupancyGrid":
+        """Create a grid in which all cells that overlap one of ``rois`` are
+        occupied."""
+
+        grid = cls(total_roi, voxel_size)
+        for roi in rois:
+            grid.add(roi)
+        return grid
+
+    @property
+    def counts(self) -> "np.ndarray":
+        """The counts per cell, as a read-only array."""
+
+        counts = self.__counts.view()
+        counts.flags.writeable = False
+        return counts
+
+    def add(self, roi: Roi, count: int = 1) -> None:
+        """Add ``count`` to all cells that overlap ``roi``.
+
+        The summed-area table is recomputed on the next query.
+        """
+
+        slices = self.__cell_slices(roi)
+        if slices is None:
+            return
+        self.__counts[slices] += count
+        self.__table = None
+
+    def count(self, roi: Roi) -> int:
+        """Get the sum of the counts of all cells that overlap ``roi``."""
+
+        slices = self.__cell_slices(roi)
+        if slices is None:
+            return 0
+
+        table = self.__summed_area_table()
+        total = 0
+        for corner in itertools.product((0, 1), repeat=len(slices)):
+            index = tuple(s.stop if c else s.start for s, c in zip(slices, corner))
+            sign = -1 if (len(corner) - sum(corner)) % 2 else 1
+            total += sign * int(table[index])
+        return total
+
+    def occupied(self, roi: Roi) -> bool:
+        """Test if any cell that overlaps ``roi`` contains data."""
+
+        return self.count(roi) > 0
+
+    def occupied_blocks(
+        self, tiling: Tiling, read_roi: bool = False
+    ) -> List[Coordinate]:
+        """Get the indices of all blocks of ``tiling`` that contain data, in
+        C order.
+
+        Args:
+
+            tiling (:class:`Tiling`):
+
+                The tiling to test the blocks of.
+
+            read_roi (``bool``, optional):
+
+                If set, test the read ROIs of the blocks instead of their
+                write ROIs.
+        """
+
+        np = import_numpy("OccupancyGrid")
+
+        dims = self.total_roi.dims
+        assert tiling.dims == dims, "dimension of tiling does not match ROI"
+
+        if len(tiling) == 0 or self.total_roi.empty:
+            return []
+
+        context = tiling.context if read_roi else Coordinate((0,) * dims)
+
+        # first and last cell (exclusive) of the blocks along each axis
+        starts, stops = [], []
+        for d in range(dims):
+            n = tiling.blocks_per_axis[d]
+            begin = (
+                tiling.total_roi.begin[d]
+                + np.arange(n, dtype=np.int64) * tiling.block_shape[d]
+            )
+            end = np.minimum(begin + tiling.block_shape[d], tiling.total_roi.end[d])
+            begin, end = begin - context[d], end + context[d]
+            start, stop = self.__cell_range(np, d, begin, end)
+            starts.append(start)
+            stops.append(stop)
+
+        table = self.__summed_area_table()
+        counts = np.zeros(tuple(tiling.blocks_per_axis), dtype=np.int64)
+        for corner in itertools.product((0, 1), repeat=dims):
+            index = np.ix_(
+                *(stops[d] if c else starts[d] for d, c in enumerate(corner))
+            )
+            if (dims - sum(corner)) % 2:
+                counts -= table[index]
+            else:
+                counts += table[index]
+
+        return [Coordinate(index) for index in np.argwhere(counts > 0).tolist()]
+
+    def __cell_range(self, np, d: int, begin, end):
+        offset = self.total_roi.begin[d]
+        v = self.voxel_size[d]
+        n = self.__counts.shape[d]
+        start = np.clip((begin - offset) // v, 0, n)
+        stop = np.clip(-((offset - end) // v), 0, n)
+        return start, stop
+
+    def __cell_slices(self, roi: Roi) -> Optional[tuple]:
+        """Get the slices of the cells that overlap ``roi``, or ``None`` if
+        there are none."""
+
+        assert roi.dims == self.total_roi.dims, "dimension of ROI does not match"
+
+        roi = roi.intersect(self.total_roi)
+        if roi.empty:
+            return None
+
+        relative = roi - self.total_roi.begin
+        start = relative.begin.floor_division(self.voxel_size)
+        stop = relative.end.ceil_division(self.voxel_size)
+        return tuple(slice(b, e) for b, e in zip(start, stop))
+
+    def __summed_area_table(self) -> "np.ndarray":
+        if self.__table is None:
+            np = import_numpy("OccupancyGrid")
+            table = np.zeros(tuple(s + 1 for s in self.__counts.shape), dtype=np.int64)
+            inner = tuple(slice(1, None) for _ in self.__counts.shape)
+            table[inner] = self.__counts
+            for d in range(table.ndim):
+                np.cumsum(table, axis=d, out=table)
+            self.__table = table
+        return self.__table
+
+    def __repr__(self) -> str:
+        return f"OccupancyGrid({self.total_roi!r}, voxel_size={self.voxel_size})"
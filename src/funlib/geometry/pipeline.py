@@ -0,0 +1,344 @@
+import itertools
+from typing import Iterable, List, Optional, Tuple, Union
+
+from ._numpy import import_numpy
+from .backend import get_backend
+from .coordinate import Coordinate
+from .roi import Roi
+
+Amount = Union[Iterable[Optional[int]], int]
+
+# smallest number of ROIs for which the numpy backend is used in apply_many
+_MIN_BATCH_SIZE = 64
+
+
+class RoiPipeline:
+    """A lazy chain of :class:`Roi` operations, applied in one fused pass.
+
+    A pipeline is declared once by chaining :meth:`shift`, :meth:`grow`,
+    :meth:`snap_to_grid`, and :meth:`intersect`. Each call returns a new
+    pipeline; nothing is computed until the pipeline is applied to a ROI::
+
+        pipeline = (
+            RoiPipeline()
+            .shift(Coordinate(10, 10))
+            .grow(context, context)
+            .snap_to_grid(voxel_size)
+            .intersect(total_roi)
+        )
+        read_roi = pipeline(block_roi)
+        read_rois = pipeline.apply_many(block_rois)
+
+    The result is the same as calling the operations on the ROI one by one,
+    but no intermediate :class:`Coordinate` or :class:`Roi` objects are
+    created. Redundant steps are simplified when the pipeline is built:
+    consecutive shifts and grows are summed up (they commute), consecutive
+    intersections are replaced by a single intersection with their common
+    ROI, and repeated snapping to the same grid is dropped.
+    """
+
+    def __init__(self, steps: Tuple[tuple, ...] = ()):
+        self.__steps = steps
+
+    @property
+    def steps(self) -> Tuple[tuple, ...]:
+        """The simplified steps of this pipeline, as tuples of the operation
+        name and its arguments."""
+        return self.__steps
+
+    def shift(self, by: Amount) -> "RoiPipeline":
+        """Append :meth:`Roi.shift`."""
+
+        return self.__shift_grow(by, 0, 0)
+
+    def grow(self, amount_neg: Amount = 0, amount_pos: Amount = 0) -> "RoiPipeline":
+        """Append :meth:`Roi.grow`."""
+
+        return self.__shift_grow(0, amount_neg, amount_pos)
+
+    def snap_to_grid(
+        self, voxel_size: Iterable[Optional[int]], mode: str = "grow"
+    ) -> "RoiPipeline":
+        """Append :meth:`Roi.snap_to_grid`."""
+
+        voxel_size = Coordinate(voxel_size)
+        assert 0 not in voxel_size, "Voxel size cannot contain zero"
+        if mode not in ("grow", "shrink", "closest"):
+            raise RuntimeError("Unknown mode %s for snap_to_grid" % mode)
+
+        step = ("snap_to_grid", voxel_size, mode)
+        if self.__steps and self.__steps[-1] == step:
+            # already aligned to this grid
+            return self
+        return RoiPipeline(self.__steps + (step,))
+
+    def intersect(self, other: Roi) -> "RoiPipeline":
+        """Append :meth:`Roi.intersect`."""
+
+        if self.__steps and self.__steps[-1][0] == "intersect":
+            other = self.__steps[-1][1].intersect(other)
+            return RoiPipeline(self.__steps[:-1] + (("intersect", other),))
+        return RoiPipeline(self.__steps + (("intersect", other),))
+
+    def __call__(self, roi: Roi) -> Roi:
+        return self.apply(roi)
+
+    def apply(self, roi: Roi) -> Roi:
+        """Apply this pipeline to a single ROI."""
+
+        offset, shape = _apply(self.__steps, list(roi.offset), list(roi.shape))
+        return Roi(offset, shape)
+
+    def apply_many(self, rois: Iterable[Roi]) -> List[Roi]:
+        """Apply this pipeline to each of ``rois``.
+
+        With the ``"numpy"`` backend (see :func:`get_backend`), large batches
+        of bounded ROIs are processed with vectorized kernels.
+        """
+
+        steps = self.__steps
+        rois = list(rois)
+        if (
+            len(rois) >= _MIN_BATCH_SIZE
+            and get_backend() == "numpy"
+            and _bounded_steps(steps)
+        ):
+            return _apply_numpy(steps, rois)
+        return [Roi(*_apply(steps, list(r.offset), list(r.shape))) for r in rois]
+
+    def __shift_grow(self, by, amount_neg, amount_pos) -> "RoiPipeline":
+        steps = self.__steps
+        if steps and steps[-1][0] == "shift_grow":
+            _, by0, neg0, pos0 = steps[-1]
+            steps = steps[:-1]
+            by, amount_neg, amount_pos = (
+                _add(by0, by),
+                _add(neg0, amount_neg),
+                _add(pos0, amount_pos),
+            )
+        return RoiPipeline(steps + (("shift_grow", by, amount_neg, amount_pos),))
+
+    def __repr__(self) -> str:
+        return f"RoiPipeline({list(self.__steps)!r})"
+
+
+def _add(a, b):
+    """Add two amounts, each an ``int`` or a tuple of ``int``/``None``."""
+
+    if not isinstance(a, Iterable) and not isinstance(b, Iterable):
+        return a + b
+    if not isinstance(a, Iterable):
+        a, b = b, a
+    a = Coordinate(a)
+    if isinstance(b, Iterable):
+        return a + Coordinate(b)
+    return a + b
+
+
+def _per_dim(amount, dims: int) -> list:
+    if isinstance(amount, Iterable):
+        amount = list(amount)
+        assert len(amount) == dims, "dimension of amount does not match ROI"
+        return amount
+    return [amount] * dims
+
+
+def _apply(
+    steps, offset: List[Optional[int]], shape: List[Optional[int]]
+) -> Tuple[List[Optional[int]], List[Optional[int]]]:
+    """Apply the pipeline steps to an offset and shape given as lists,
+    following the semantics of the corresponding :class:`Roi` methods."""
+
+    dims = len(shape)
+
+    for step in steps:
+        op = step[0]
+
+        if op == "shift_grow":
+            by = _per_dim(step[1], dims)
+            neg = _per_dim(step[2], dims)
+            pos = _per_dim(step[3], dims)
+            for d in range(dims):
+                o, s = offset[d], shape[d]
+                if s is not None:
+                    s = (
+                        s + neg[d] + pos[d]
+                        if neg[d] is not None and pos[d] is not None
+                        else None
+                    )
+                if o is not None:
+                    o = (
+                        o + by[d] - neg[d]
+                        if by[d] is not None and neg[d] is not None
+                        else None
+                    )
+                offset[d] = o if s is not None else None
+                shape[d] = s
+
+        elif op == "snap_to_grid":
+            _, voxel_size, mode = step
+            assert len(voxel_size) == dims, "dimension of voxel size does not match ROI"
+            for d in range(dims):
+                o, s, v = offset[d], shape[d], voxel_size[d]
+                if o is None or s is None or v is None:
+                    b = e = None
+                elif mode == "grow":
+                    b = o // v
+                    e = (o + s + v - 1) // v
+                elif mode == "shrink":
+                    b = (o + v - 1) // v
+                    e = (o + s) // v
+                else:
+                    b = (o + (v - 1) // 2) // v
+                    e = (o + s + (v - 1) // 2) // v
+                s = (e - b) * v if b is not None and e is not None else None
+                offset[d] = b * v if b is not None and s is not None else None
+                shape[d] = s
+
+        elif op == "intersect":
+            other = step[1]
+            assert other.dims == dims, "dimension of ROIs does not match"
+            separated = _empty(shape) or other.empty
+
+            begins, ends = [], []
+            for d in range(dims):
+                if separated:
+                    break
+                b1, s1 = offset[d], shape[d]
+                e1 = b1 + s1 if b1 is not None and s1 is not None else None
+                b2, e2 = other.begin[d], other.end[d]
+                if None not in (b1, b2, e1, e2) and (b1 >= e2 or b2 >= e1):
+                    separated = True
+                begins.append(_left_max(b1, b2))
+                ends.append(_right_min(e1, e2))
+
+            if separated:
+                for d in range(dims):
+                    offset[d], shape[d] = None, 0
+                continue
+
+            for d in range(dims):
+                b, e = begins[d], ends[d]
+                s = e - b if b is not None and e is not None else None
+                offset[d] = b if s is not None else None
+                shape[d] = s
+
+    return offset, shape
+
+
+def _bounded_steps(steps) -> bool:
+    """Test if none of the steps contains unbounded values."""
+
+    for step in steps:
+        if step[0] == "intersect":
+            if step[1].unbounded:
+                return False
+        else:
+            for amount in step[1:]:
+                if isinstance(amount, Iterable) and not isinstance(amount, str):
+                    if None in amount:
+                        return False
+                elif amount is None:
+                    return False
+    return True
+
+
+def _apply_numpy(steps, rois: List[Roi]) -> List[Roi]:
+    """Vectorized version of :func:`_apply` for many ROIs.
+
+    Only bounded ROIs that stay non-empty are computed with numpy, all others
+    fall back to :func:`_apply` to follow the semantics of :class:`Roi` for
+    empty and unbounded ROIs exactly.
+    """
+
+    np = import_numpy("RoiPipeline.apply_many")
+
+    dims = rois[0].dims
+    bounded = [
+        i
+        for i, r in enumerate(rois)
+        if None not in r.offset and None not in r.shape and r.dims == dims
+    ]
+    count = len(bounded) * dims
+    offset = np.fromiter(
+        itertools.chain.from_iterable(rois[i].offset for i in bounded),
+        dtype=np.int64,
+        count=count,
+    ).reshape(len(bounded), dims)
+    shape = np.fromiter(
+        itertools.chain.from_iterable(rois[i].shape for i in bounded),
+        dtype=np.int64,
+        count=count,
+    ).reshape(len(bounded), dims)
+    fallback = np.zeros(len(bounded), dtype=bool)
+
+    for step in steps:
+        op = step[0]
+
+        if op == "shift_grow":
+            by, neg, pos = (
+                np.array(_per_dim(amount, dims), dtype=np.int64) for amount in step[1:]
+            )
+            shape = shape + neg + pos
+            offset = offset + by - neg
+
+        elif op == "snap_to_grid":
+            _, voxel_size, mode = step
+            assert len(voxel_size) == dims, "dimension of voxel size does not match ROI"
+            v = np.array(voxel_size, dtype=np.int64)
+            end = offset + shape
+            if mode == "grow":
+                b, e = offset // v, (end + v - 1) // v
+            elif mode == "shrink":
+                b, e = (offset + v - 1) // v, end // v
+            else:
+                b, e = (offset + (v - 1) // 2) // v, (end + (v - 1) // 2) // v
+            offset, shape = b * v, (e - b) * v
+
+        elif op == "intersect":
+            other = step[1]
+            assert other.dims == dims, "dimension of ROIs does not match"
+            if other.empty:
+                fallback[:] = True
+                continue
+            b2 = np.array(other.begin, dtype=np.int64)
+            e2 = np.array(other.end, dtype=np.int64)
+            end = offset + shape
+            fallback |= (shape <= 0).any(axis=1)
+            fallback |= ((offset >= e2) | (b2 >= end)).any(axis=1)
+            offset = np.maximum(offset, b2)
+            shape = np.minimum(end, e2) - offset
+
+    computed = {
+        i: Roi(o, s)
+        for i, o, s, f in zip(bounded, offset.tolist(), shape.tolist(), fallback)
+        if not f
+    }
+    return [
+        computed[i]
+        if i in computed
+        else Roi(*_apply(steps, list(roi.offset), list(roi.shape)))
+        for i, roi in enumerate(rois)
+    ]
+
+
+def _empty(shape: List[Optional[int]]) -> bool:
+    return any(s is not None and s <= 0 for s in shape)
+
+
+def _left_max(x, y):
+    # None is considered -inf
+    if x is None:
+        return y
+    if y is None:
+        return x
+    return max(x, y)
+
+
+def _right_min(x, y):
+    # None is considered +inf
+    if x is None:
+        return y
+    if y is None:
+        return x
+    return min(x, y)
@@ -0,0 +1,279 @@
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .coordinate import Coordinate
+from .roi import Roi
+from .tiling import Tiling
+
+
+class RechunkPlan:
+    """A plan to copy a volume from one chunk grid to another, as returned by
+    :func:`plan_rechunk`.
+
+    The copy is done block by block. Each block writes whole target chunks
+    (clipped to ``total_roi``) and reads the source chunks it overlaps, i.e.,
+    its write ROI snapped to the source chunk grid::
+
+        for read_roi, write_roi in plan.blocks():
+            data = source[read_roi]
+            target[write_roi] = data[write_roi]
+
+    Attributes:
+
+        total_roi (:class:`Roi`):
+
+            The ROI to copy.
+
+        block_shape (:class:`Coordinate`):
+
+            The shape of the write ROI of each block, a multiple of the target
+            chunk shape.
+
+        read_bytes (``int``):
+
+            The number of bytes read from the source, counting source chunks
+            that are read by several blocks multiple times.
+
+        write_bytes (``int``):
+
+            The number of bytes written to the target.
+
+        memory (``int``):
+
+            The number of bytes of the largest read ROI, i.e., the memory
+            needed to process one block.
+
+        num_source_chunks (``int``):
+
+            The number of source chunks that overlap ``total_roi``.
+
+        num_source_reads (``int``):
+
+            The number of source chunk reads of the plan.
+    """
+
+    def __init__(
+        self,
+        total_roi: Roi,
+        source_chunk_shape: Coordinate,
+        block_shape: Coordinate,
+        read_bytes: int,
+        write_bytes: int,
+        memory: int,
+        num_source_chunks: int,
+        num_source_reads: int,
+    ):
+        self.total_roi = total_roi
+        self.source_chunk_shape = source_chunk_shape
+        self.block_shape = block_shape
+        self.read_bytes = read_bytes
+        self.write_bytes = write_bytes
+        self.memory = memory
+        self.num_source_chunks = num_source_chunks
+        self.num_source_reads = num_source_reads
+
+    @property
+    def read_amplification(self) -> float:
+        """How often each source chunk is read on average. ``1.0`` means that
+        every source chunk is read exactly once."""
+
+        if self.num_source_chunks == 0:
+            return 1.0
+        return self.num_source_reads / self.num_source_chunks
+
+    def __len__(self) -> int:
+        return len(self.__tiling())
+
+    def blocks(self) -> Iterator[Tuple[Roi, Roi]]:
+        """Iterate over the ``(read_roi, write_roi)`` of all blocks."""
+
+        tiling = self.__tiling()
+        for index in tiling.block_indices():
+            write_roi = tiling.write_roi(index).intersect(self.total_roi)
+            yield write_roi.snap_to_grid(self.source_chunk_shape), write_roi
+
+    def __tiling(self) -> Tiling:
+        return Tiling(self.total_roi.snap_to_grid(self.block_shape), self.block_shape)
+
+    def __repr__(self) -> str:
+        return (
+            f"RechunkPlan({self.total_roi!r}, block_shape={self.block_shape}, "
+            f"read_bytes={self.read_bytes}, write_bytes={self.write_bytes}, "
+            f"memory={self.memory})"
+        )
+
+
+def plan_rechunk(
+    total_roi: Roi,
+    source_chunk_shape: Iterable[int],
+    target_chunk_shape: Iterable[int],
+    element_size: int,
+    max_memory: int,
+    voxel_size: Optional[Iterable[int]] = None,
+) -> RechunkPlan:
+    """Plan to copy ``total_roi`` from a source to a target chunk grid with
+    bounded memory.
+
+    Both chunk grids start at the origin. The plan processes blocks that are
+    multiples of the target chunk shape, such that every target chunk is
+    written exactly once. Among those, the block shape is chosen that reads
+    the least amount of data from the source, while the largest read ROI
+    fits into ``max_memory``::
+
+        plan = plan_rechunk(
+            Roi((0, 0, 0), (1024, 4096, 4096)),
+            source_chunk_shape=(1, 4096, 4096),  # sections
+            target_chunk_shape=(64, 64, 64),  # cubes
+            element_size=1,
+            max_memory=2**30,
+        )
+        plan.block_shape  # Coordinate(64, 4096, 4096)
+        plan.read_amplification  # 1.0
+
+    If blocks that are aligned to both grids fit into memory, every source
+    chunk is read exactly once. Otherwise, source chunks on the boundaries
+    of blocks are read several times, which is reported by
+    :attr:`RechunkPlan.read_bytes` and
+    :attr:`RechunkPlan.read_amplification`.
+
+    Args:
+
+        total_roi (:class:`Roi`):
+
+            The bounded ROI to copy.
+
+        source_chunk_shape (:class:`Coordinate` or ``tuple``):
+
+            The shape of the chunks to read, in world units.
+
+        target_chunk_shape (:class:`Coordinate` or ``tuple``):
+
+            The shape of the chunks to write, in world units.
+
+        element_size (``int``):
+
+            The number of bytes per voxel.
+
+        max_memory (``int``):
+
+            The maximal number of bytes to read for a single block.
+
+        voxel_size (:class:`Coordinate` or ``tuple``, optional):
+
+            The size of a voxel in world units. Defaults to one in each
+            dimension.
+    """
+
+    dims = total_roi.dims
+    if voxel_size is None:
+        voxel_size = (1,) * dims
+
+    source_chunk_shape = Coordinate(source_chunk_shape)
+    target_chunk_shape = Coordinate(target_chunk_shape)
+    voxel_size = Coordinate(voxel_size)
+
+    assert not total_roi.unbounded, "can only rechunk bounded ROIs"
+    assert not total_roi.empty, "can not rechunk an empty ROI"
+    for name, shape in (
+        ("source chunk shape", source_chunk_shape),
+        ("target chunk shape", target_chunk_shape),
+        ("voxel size", voxel_size),
+    ):
+        assert shape.dims == dims, "dimension of %s does not match ROI" % name
+        assert all(s > 0 for s in shape), "%s has to be positive" % name
+    assert element_size > 0, "element size has to be positive"
+
+    voxel_volume = 1
+    for v in voxel_size:
+        voxel_volume *= v
+
+    def to_bytes(volume: int) -> int:
+        return volume // voxel_volume * element_size
+
+    # the memory budget as world volume
+    max_volume = max_memory * voxel_volume // element_size
+
+    # Read volume and memory of a block factorize over dimensions: the total
+    # read volume is the product of the summed read lengths per dimension,
+    # and the largest read ROI is the product of the largest read lengths.
+    # Find the candidates per dimension and combine them, keeping only plans
+    # that are not dominated in memory and read volume.
+    plans: List[Tuple[int, int, tuple]] = [(1, 1, ())]
+    for d in range(dims):
+        candidates = _axis_candidates(
+            total_roi.begin[d],
+            total_roi.end[d],
+            source_chunk_shape[d],
+            target_chunk_shape[d],
+        )
+        plans = _pareto(
+            (memory * m, reads * r, sizes + (size,))
+            for memory, reads, sizes in plans
+            for size, r, m in candidates
+            if memory * m <= max_volume
+        )
+        if not plans:
+            raise RuntimeError(
+                "a single target chunk of shape %s does not fit into %d bytes when "
+                "read from source chunks of shape %s"
+                % (target_chunk_shape, max_memory, source_chunk_shape)
+            )
+
+    memory, reads, block_shape = min(plans, key=lambda p: (p[1], p[0]))
+
+    source_volume = 1
+    for s in source_chunk_shape:
+        source_volume *= s
+    num_source_chunks = 1
+    for n in total_roi.snap_to_grid(source_chunk_shape).shape // source_chunk_shape:
+        num_source_chunks *= n
+
+    total_size = total_roi.size
+    assert total_size is not None
+
+    return RechunkPlan(
+        total_roi,
+        source_chunk_shape,
+        Coordinate(block_shape),
+        read_bytes=to_bytes(reads),
+        write_bytes=to_bytes(total_size),
+        memory=to_bytes(memory),
+        num_source_chunks=num_source_chunks,
+        num_source_reads=reads // source_volume,
+    )
+
+
+def _axis_candidates(
+    begin: int, end: int, source: int, target: int
+) -> List[Tuple[int, int, int]]:
+    """Get ``(block_size, read_length, max_read_length)`` for all block sizes
+    along one dimension that are not dominated by another size."""
+
+    num_target_chunks = -(-end // target) - begin // target
+
+    candidates = []
+    for k in range(1, num_target_chunks + 1):
+        size = k * target
+        read_length = 0
+        max_read_length = 0
+        block_begin = begin // size * size
+        while block_begin < end:
+            lo = max(block_begin, begin)
+            hi = min(block_begin + size, end)
+            length = -(-hi // source) * source - lo // source * source
+            read_length += length
+            max_read_length = max(max_read_length, length)
+            block_begin += size
+        candidates.append((size, read_length, max_read_length))
+
+    return [(s, r, m) for m, r, s in _pareto((m, r, s) for s, r, m in candidates)]
+
+
+def _pareto(items: Iterable[tuple]) -> list:
+    """Keep only the ``(memory, reads, ...)`` tuples for which no other tuple
+    needs less memory and fewer reads."""
+
+    front: list = []
+    for item in sorted(items, key=lambda i: (i[0], i[1])):
+        if not front or item[1] < front[-1][1]:
+            front.append(item)
+    return front
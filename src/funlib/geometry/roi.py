@@ -1,7 +1,9 @@
 import copy
+import itertools
 import logging
-from typing import Iterable, Optional, Tuple, Union
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union
 
+from ._memoize import memoizable
 from .coordinate import Coordinate
 from .freezable import Freezable
 
@@ -261,6 +263,7 @@ class Roi(Freezable):
 
         return not separated
 
+    @memoizable
     def intersect(self, other: "Roi") -> "Roi":
         """Get the intersection of this ROI with another :class:`Roi`."""
 
@@ -299,6 +302,7 @@ class Roi(Freezable):
 
         return Roi(self.__offset + by, self.__shape)
 
+    @memoizable
     def snap_to_grid(
         self, voxel_size: Iterable[Optional[int]], mode: str = "grow"
     ) -> "Roi":
@@ -341,6 +345,7 @@ class Roi(Freezable):
             begin_in_voxel * voxel_size, (end_in_voxel - begin_in_voxel) * voxel_size
         )
 
+    @memoizable
     def grow(
         self,
         amount_neg: Union[Iterable[Optional[int]], int] = 0,
@@ -376,6 +381,134 @@ class Roi(Freezable):
 
         return Roi(offset, shape)
 
+    def subdivide(
+        self,
+        predicate: Optional[Callable[["Roi"], bool]] = None,
+        cost: Optional[Callable[["Roi"], float]] = None,
+        max_cost: float = 0,
+        voxel_size: Optional[Iterable[int]] = None,
+        max_depth: Optional[int] = None,
+        min_shape: Optional[Union[Iterable[int], int]] = None,
+    ) -> Iterator["Roi"]:
+        """Adaptively split this ROI into an octree (quadtree in 2D, ...) and
+        yield the leaves.
+
+        A ROI is split in half along each dimension, giving up to
+        ``2**dims`` children, as long as ``predicate(roi)`` is true (or
+        ``cost(roi) > max_cost``). The ROI has to be aligned with
+        ``voxel_size``, and the split points are snapped to it with
+        :meth:`snap_to_grid`. Leaves are generated lazily in depth-first order, such
+        that ``predicate``/``cost`` are only evaluated for ROIs that are
+        reached::
+
+            roi = Roi((0, 0), (1024, 1024))
+            leaves = roi.subdivide(
+                cost=lambda r: count_objects(r),
+                max_cost=100,
+                voxel_size=(8, 8),
+                min_shape=(64, 64),
+            )
+
+        Args:
+
+            predicate (callable, optional):
+
+                Called with a ROI, returns whether it should be split.
+
+            cost (callable, optional):
+
+                Called with a ROI, returns the cost of processing it. ROIs are
+                split if their cost exceeds ``max_cost``. Exactly one of
+                ``predicate`` and ``cost`` has to be given.
+
+            max_cost (``float``, optional):
+
+                The largest cost of a leaf. Defaults to zero.
+
+            voxel_size (:class:`Coordinate` or ``tuple``, optional):
+
+                The grid to align split points to. Defaults to one in each
+                dimension.
+
+            max_depth (``int``, optional):
+
+                The maximal number of times a ROI is split.
+
+            min_shape (:class:`Coordinate` or ``int``, optional):
+
+                The smallest shape of a child, has to be positive. Dimensions
+                that can not be split without creating smaller children are
+                not split. Defaults to ``voxel_size``.
+        """
+
+        assert (predicate is None) != (cost is None), (
+            "exactly one of predicate and cost has to be given"
+        )
+        assert not self.unbounded, "can only subdivide bounded ROIs"
+
+        if cost is not None:
+            _cost = cost
+
+            def split(roi):
+                return _cost(roi) > max_cost
+
+        else:
+            assert predicate is not None
+            split = predicate
+
+        if voxel_size is None:
+            voxel_size = (1,) * self.dims
+        voxel_size = Coordinate(voxel_size)
+        if min_shape is None:
+            min_shape = voxel_size
+        elif not isinstance(min_shape, Iterable):
+            min_shape = (min_shape,) * self.dims
+        min_shape = Coordinate(min_shape)
+
+        assert voxel_size.dims == self.dims, (
+            "dimension of voxel size does not match ROI"
+        )
+        assert min_shape.dims == self.dims, "dimension of min shape does not match ROI"
+        assert all(m > 0 for m in min_shape), "min shape has to be positive"
+
+        if self.empty:
+            return
+
+        assert self.snap_to_grid(voxel_size) == self, (
+            "ROI %s is not aligned with voxel size %s" % (self, voxel_size)
+        )
+
+        stack = [(Roi(self.__offset, self.__shape), 0)]
+        while stack:
+            roi, depth = stack.pop()
+
+            if (max_depth is not None and depth >= max_depth) or not split(roi):
+                yield roi
+                continue
+
+            # split points, snapped to the closest grid point of the center
+            mids = (
+                Roi(roi.begin, roi.shape // 2).snap_to_grid(voxel_size, "closest").end
+            )
+
+            # intervals to split each dimension into
+            intervals = []
+            for b, e, mid, m in zip(roi.begin, roi.end, mids, min_shape):
+                if mid - b >= m and e - mid >= m:
+                    intervals.append(((b, mid), (mid, e)))
+                else:
+                    intervals.append(((b, e),))
+
+            if all(len(i) == 1 for i in intervals):
+                yield roi
+                continue
+
+            children = [
+                Roi([b for b, _ in child], [e - b for b, e in child])
+                for child in itertools.product(*intervals)
+            ]
+            stack.extend((child, depth + 1) for child in reversed(children))
+
     def copy(self) -> "Roi":
         """Create a copy of this ROI."""
         return copy.deepcopy(self)
@@ -0,0 +1,201 @@
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional
+
+from ._numpy import import_numpy
+from .coordinate import Coordinate
+from .roi import Roi
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class PatchSampler:
+    """Sample random patches of a fixed shape inside a ROI.
+
+    All patches lie entirely inside ``total_roi`` and their offsets are
+    multiples of ``voxel_size``. Offsets are drawn for a whole batch at once
+    and returned as an ``int64`` array of shape ``(num, dims)``::
+
+        sampler = PatchSampler(
+            Roi((0, 0, 0), (1000, 1000, 1000)),
+            patch_shape=(100, 100, 100),
+            voxel_size=(4, 4, 4),
+            seed=42,
+        )
+        offsets = sampler.sample(10000)
+        rois = sampler.rois(offsets[:10])
+
+    Optionally, a coarse ``weights`` array over ``total_roi`` can be given.
+    The probability of a patch is then proportional to the weight of the cell
+    that contains its center. Cells with a weight of zero are never sampled,
+    i.e., a boolean array can be used as a mask. Samples are drawn directly
+    from the valid positions, there is no rejection loop.
+
+    Requires ``numpy``.
+
+    Args:
+
+        total_roi (:class:`Roi`):
+
+            The bounded ROI to sample patches from.
+
+        patch_shape (:class:`Coordinate` or ``tuple``):
+
+            The shape of the patches to sample.
+
+        voxel_size (:class:`Coordinate` or ``tuple``, optional):
+
+            The grid to align patch offsets to. Defaults to one in each
+            dimension.
+
+        weights (array-like, optional):
+
+            Non-negative sampling weights on a grid of ``weights_voxel_size``
+            starting at ``total_roi.begin``. The shape has to be
+            ``total_roi.shape / weights_voxel_size``, rounded up.
+
+        weights_voxel_size (:class:`Coordinate` or ``tuple``, optional):
+
+            The size of a cell of ``weights``. Required if ``weights`` is given.
+
+        seed (``int`` or ``numpy.random.Generator``, optional):
+
+            The seed or random generator to use. Samplers created with the
+            same seed produce the same sequence of offsets.
+    """
+
+    def __init__(
+        self,
+        total_roi: Roi,
+        patch_shape: Iterable[int],
+        voxel_size: Optional[Iterable[int]] = None,
+        weights: Optional[Any] = None,
+        weights_voxel_size: Optional[Iterable[int]] = None,
+        seed: Optional[Any] = None,
+    ):
+        np = import_numpy("PatchSampler")
+
+        if voxel_size is None:
+            voxel_size = (1,) * total_roi.dims
+
+        self.total_roi = total_roi
+        self.patch_shape = Coordinate(patch_shape)
+        self.voxel_size = Coordinate(voxel_size)
+
+        assert not total_roi.unbounded, "can only sample from bounded ROIs"
+        assert self.patch_shape.dims == total_roi.dims, (
+            "dimension of patch shape does not match ROI"
+        )
+        assert self.voxel_size.dims == total_roi.dims, (
+            "dimension of voxel size does not match ROI"
+        )
+
+        # smallest and largest aligned offset per dimension
+        min_offset = total_roi.begin.ceil_division(self.voxel_size) * self.voxel_size
+        max_offset = (total_roi.end - self.patch_shape).floor_division(
+            self.voxel_size
+        ) * self.voxel_size
+        if total_roi.empty or any(a > b for a, b in zip(min_offset, max_offset)):
+            raise RuntimeError(
+                "no aligned patch of shape %s fits into %s"
+                % (self.patch_shape, total_roi)
+            )
+        self.__min_offset = min_offset
+        self.__num_offsets = (max_offset - min_offset) // self.voxel_size + 1
+
+        self.__rng = np.random.default_rng(seed)
+        self.__cell_cdf = None
+
+        if weights is not None:
+            assert weights_voxel_size is not None, (
+                "weights_voxel_size is required for weights"
+            )
+            self.__init_weights(np.asarray(weights), Coordinate(weights_voxel_size))
+
+    @property
+    def num_positions(self) -> int:
+        """The number of distinct aligned patch offsets (ignoring weights)."""
+
+        num_positions = 1
+        for n in self.__num_offsets:
+            num_positions *= n
+        return num_positions
+
+    def sample(self, num: int) -> "np.ndarray":
+        """Sample the offsets of ``num`` patches."""
+
+        np = import_numpy("PatchSampler")
+
+        dims = self.total_roi.dims
+        if self.__cell_cdf is None:
+            steps = np.stack(
+                [self.__rng.integers(0, n, size=num) for n in self.__num_offsets],
+                axis=1,
+            )
+        else:
+            u = self.__rng.random(num) * self.__cell_cdf[-1]
+            cells = np.searchsorted(self.__cell_cdf, u, side="right")
+            cells = np.minimum(cells, len(self.__cell_cdf) - 1)
+            cells = np.unravel_index(cells, self.__cell_grid_shape)
+            steps = np.empty((num, dims), dtype=np.int64)
+            for d in range(dims):
+                first = self.__cell_first_step[d][cells[d]]
+                count = self.__cell_num_steps[d][cells[d]]
+                steps[:, d] = first + (self.__rng.random(num) * count).astype(np.int64)
+
+        offsets = steps.astype(np.int64) * np.array(self.voxel_size, dtype=np.int64)
+        offsets += np.array(self.__min_offset, dtype=np.int64)
+
+        return offsets
+
+    def rois(self, offsets: "np.ndarray") -> List[Roi]:
+        """Convert sampled offsets into a list of :class:`Roi`."""
+
+        return [Roi(offset, self.patch_shape) for offset in offsets.tolist()]
+
+    def __init_weights(self, weights: "np.ndarray", cell_size: Coordinate) -> None:
+        np = import_numpy("PatchSampler")
+
+        dims = self.total_roi.dims
+        assert cell_size.dims == dims, (
+            "dimension of weights voxel size does not match ROI"
+        )
+        assert weights.shape == self.total_roi.shape.ceil_division(cell_size), (
+            "shape of weights %s does not match ROI %s with weights voxel size %s"
+            % (weights.shape, self.total_roi, cell_size)
+        )
+        assert (weights >= 0).all(), "weights have to be non-negative"
+
+        # For each cell along each dimension, find the range of offset steps
+        # that place the patch center inside the cell.
+        self.__cell_first_step = []
+        self.__cell_num_steps = []
+        for d in range(dims):
+            half = self.patch_shape[d] // 2
+            step = self.voxel_size[d]
+            n = self.__num_offsets[d]
+            cell_begin = (
+                self.total_roi.begin[d]
+                + np.arange(weights.shape[d], dtype=np.int64) * cell_size[d]
+            )
+            cell_end = np.minimum(cell_begin + cell_size[d], self.total_roi.end[d])
+            # ceiling division of (position - half - min_offset) by step
+            first = -((self.__min_offset[d] + half - cell_begin) // step)
+            end = -((self.__min_offset[d] + half - cell_end) // step)
+            first = np.clip(first, 0, n)
+            end = np.clip(end, 0, n)
+            self.__cell_first_step.append(first)
+            self.__cell_num_steps.append(end - first)
+
+        # probability of a cell is its weight times its number of positions
+        cell_mass = weights.astype(np.float64)
+        for d in range(dims):
+            shape = [1] * dims
+            shape[d] = -1
+            cell_mass = cell_mass * self.__cell_num_steps[d].reshape(shape)
+
+        cdf = np.cumsum(cell_mass.ravel())
+        if cdf[-1] <= 0:
+            raise RuntimeError("weights are zero for all valid patch positions")
+
+        self.__cell_cdf = cdf
+        self.__cell_grid_shape = weights.shape
@@ -0,0 +1,293 @@
+import itertools
+from collections import namedtuple
+from typing import Iterable, Iterator, List, Optional, Union
+
+from ._numpy import import_numpy
+from .coordinate import Coordinate
+from .roi import Roi
+
+Neighbor = namedtuple("Neighbor", ["index", "direction", "halo_in", "halo_out"])
+Neighbor.__doc__ = """A neighbour of a block in a :class:`Tiling`.
+
+    index (:class:`Coordinate`):
+
+        The grid index of the neighbour.
+
+    direction (:class:`Coordinate`):
+
+        The offset of the neighbour in the grid, with entries in ``{-1, 0, 1}``.
+
+    halo_in (:class:`Roi`):
+
+        The part of the neighbour's write ROI that the block reads.
+
+    halo_out (:class:`Roi`):
+
+        The part of the block's write ROI that the neighbour reads.
+"""
+
+NeighborTable = namedtuple(
+    "NeighborTable", ["directions", "neighbors", "halo_in_begin", "halo_in_end"]
+)
+NeighborTable.__doc__ = """Neighbours of all blocks of a :class:`Tiling`, as
+returned by :meth:`Tiling.neighbor_table`.
+
+    directions (``ndarray`` of shape ``(3**dims - 1, dims)``):
+
+        The grid offsets of all possible neighbours.
+
+    neighbors (``ndarray`` of shape ``(num_blocks, 3**dims - 1)``):
+
+        The linear index of the neighbour in each direction, or ``-1`` if the
+        block has no neighbour in that direction.
+
+    halo_in_begin, halo_in_end (``ndarray``):
+
+        Begin and end of the part of the neighbour's write ROI that the block
+        reads, of shape ``(num_blocks, 3**dims - 1, dims)``. Invalid
+        neighbours have ``begin == end``. The ROI a block sends
+        to its neighbour in direction ``d`` is the ROI the neighbour reads from
+        the block in direction ``-d``.
+"""
+
+
+class Tiling:
+    """A regular tiling of a :class:`Roi` into blocks with context.
+
+    The write ROIs of the blocks partition ``total_roi``: they are laid out on
+    a grid of ``block_shape`` starting at ``total_roi.begin``, and the blocks
+    in the last row of each dimension are truncated to fit. The read ROI of
+    each block is its write ROI grown by ``context`` in both directions, such
+    that neighbouring read ROIs overlap by ``2 * context``::
+
+        tiling = Tiling(Roi((0, 0), (100, 100)), (40, 40), context=4)
+        tiling.blocks_per_axis      # Coordinate(3, 3)
+        tiling.write_roi((2, 0))    # Roi((80, 0), (20, 40))
+        tiling.read_roi((2, 0))     # Roi((76, -4), (28, 48))
+
+    Args:
+
+        total_roi (:class:`Roi`):
+
+            The bounded ROI to tile.
+
+        block_shape (:class:`Coordinate` or ``tuple``):
+
+            The shape of the write ROI of each block.
+
+        context (:class:`Coordinate` or ``int``, optional):
+
+            The amount by which the read ROIs extend beyond the write ROIs in
+            each direction. Defaults to zero.
+    """
+
+    def __init__(
+        self,
+        total_roi: Roi,
+        block_shape: Iterable[int],
+        context: Union[Iterable[int], int] = 0,
+    ):
+        if not isinstance(context, Iterable):
+            context = (context,) * total_roi.dims
+
+        self.__total_roi = total_roi
+        self.__block_shape = Coordinate(block_shape)
+        self.__context = Coordinate(context)
+
+        assert not total_roi.unbounded, "can only tile bounded ROIs"
+        assert self.__block_shape.dims == total_roi.dims, (
+            "dimension of block shape does not match ROI"
+        )
+        assert self.__context.dims == total_roi.dims, (
+            "dimension of context does not match ROI"
+        )
+        assert all(s > 0 for s in self.__block_shape), "block shape has to be positive"
+        assert all(c >= 0 for c in self.__context), "context can not be negative"
+
+        if total_roi.empty:
+            self.__blocks_per_axis = Coordinate((0,) * total_roi.dims)
+        else:
+            self.__blocks_per_axis = total_roi.shape.ceil_division(self.__block_shape)
+
+    @property
+    def total_roi(self) -> Roi:
+        return self.__total_roi
+
+    @property
+    def block_shape(self) -> Coordinate:
+        return self.__block_shape
+
+    @property
+    def context(self) -> Coordinate:
+        return self.__context
+
+    @property
+    def dims(self) -> int:
+        return self.__total_roi.dims
+
+    @property
+    def blocks_per_axis(self) -> Coordinate:
+        """The number of blocks along each dimension."""
+        return self.__blocks_per_axis
+
+    @property
+    def total_read_roi(self) -> Roi:
+        """The union of all read ROIs."""
+        return self.__total_roi.grow(self.__context, self.__context)
+
+    def __len__(self) -> int:
+        num_blocks = 1
+        for n in self.__blocks_per_axis:
+            num_blocks *= n
+        return num_blocks
+
+    def block_indices(self) -> Iterator[Coordinate]:
+        """Iterate over the grid indices of all blocks, in C order."""
+
+        for index in itertools.product(*(range(n) for n in self.__blocks_per_axis)):
+            yield Coordinate(index)
+
+    def contains_index(self, index: Iterable[int]) -> bool:
+        """Test if ``index`` is a valid block index of this tiling."""
+
+        return all(0 <= i < n for i, n in zip(index, self.__blocks_per_axis))
+
+    def write_roi(self, index: Iterable[int]) -> Roi:
+        """Get the write ROI of the block with the given grid index."""
+
+        index = Coordinate(index)
+        assert self.contains_index(index), f"block index {index} out of bounds"
+
+        begin = self.__total_roi.begin + index * self.__block_shape
+        roi = Roi(begin, self.__block_shape)
+        return roi.intersect(self.__total_roi)
+
+    def read_roi(self, index: Iterable[int]) -> Roi:
+        """Get the read ROI of the block with the given grid index."""
+
+        return self.write_roi(index).grow(self.__context, self.__context)
+
+    def linear_index(self, index: Iterable[int]) -> int:
+        """Get the position of the block with the given grid index in
+        :meth:`block_indices`."""
+
+        linear_index = 0
+        for i, n in zip(index, self.__blocks_per_axis):
+            linear_index = linear_index * n + i
+        return linear_index
+
+    def neighbors(self, index: Iterable[int]) -> List[Neighbor]:
+        """Get the face, edge, and corner neighbours of a block, together with
+        the halo regions they exchange.
+
+        The context of the tiling can not be larger than the block shape, such
+        that read ROIs only overlap with direct neighbours. The neighbours are
+        found in ``O(3**dims)``, sorted by their direction.
+        """
+
+        index = Coordinate(index)
+        assert self.contains_index(index), f"block index {index} out of bounds"
+        self.__check_context()
+
+        write_roi = self.write_roi(index)
+        read_roi = write_roi.grow(self.__context, self.__context)
+
+        neighbors = []
+        for direction in itertools.product((-1, 0, 1), repeat=self.dims):
+            if not any(direction):
+                continue
+            direction = Coordinate(direction)
+            neighbor = index + direction
+            if not self.contains_index(neighbor):
+                continue
+            neighbor_write_roi = self.write_roi(neighbor)
+            neighbor_read_roi = neighbor_write_roi.grow(self.__context, self.__context)
+            neighbors.append(
+                Neighbor(
+                    neighbor,
+                    direction,
+                    read_roi.intersect(neighbor_write_roi),
+                    write_roi.intersect(neighbor_read_roi),
+                )
+            )
+
+        return neighbors
+
+    def neighbor_table(self) -> NeighborTable:
+        """Get the neighbours of all blocks and the halo regions they read
+        from each other as arrays, see :class:`NeighborTable`.
+
+        Blocks are identified by their :meth:`linear_index`. Requires
+        ``numpy``.
+        """
+
+        np = import_numpy("Tiling.neighbor_table")
+        self.__check_context()
+
+        dims = self.dims
+        directions = np.array(
+            [d for d in itertools.product((-1, 0, 1), repeat=dims) if any(d)],
+            dtype=np.int64,
+        ).reshape(-1, dims)
+
+        if len(self) == 0:
+            halo = np.zeros((0, len(directions), dims), dtype=np.int64)
+            return NeighborTable(
+                directions,
+                np.zeros((0, len(directions)), dtype=np.int64),
+                halo,
+                halo.copy(),
+            )
+
+        grid = tuple(self.__blocks_per_axis)
+        indices = np.indices(grid).reshape(dims, -1).T
+
+        total_begin = np.array(self.__total_roi.begin, dtype=np.int64)
+        total_end = np.array(self.__total_roi.end, dtype=np.int64)
+        block_shape = np.array(self.__block_shape, dtype=np.int64)
+        context = np.array(self.__context, dtype=np.int64)
+
+        def write_roi(grid_indices):
+            begin = total_begin + grid_indices * block_shape
+            return begin, np.minimum(begin + block_shape, total_end)
+
+        write_begin, write_end = write_roi(indices)
+        read_begin, read_end = write_begin - context, write_end + context
+
+        # (num_blocks, num_directions, dims)
+        neighbor_indices = indices[:, None, :] + directions[None, :, :]
+        valid = ((neighbor_indices >= 0) & (neighbor_indices < grid)).all(axis=2)
+
+        neighbors = np.where(
+            valid,
+            np.ravel_multi_index(tuple(neighbor_indices.T), grid, mode="clip").T,
+            -1,
+        )
+
+        neighbor_begin, neighbor_end = write_roi(neighbor_indices)
+        halo_begin = np.maximum(read_begin[:, None, :], neighbor_begin)
+        halo_end = np.minimum(read_end[:, None, :], neighbor_end)
+        halo_end = np.maximum(halo_end, halo_begin)
+        halo_end = np.where(valid[:, :, None], halo_end, halo_begin)
+
+        return NeighborTable(directions, neighbors, halo_begin, halo_end)
+
+    def __check_context(self) -> None:
+        assert all(c <= s for c, s in zip(self.__context, self.__block_shape)), (
+            "context has to be smaller than block shape to find neighbours"
+        )
+
+    def block_index(self, position: Iterable[Optional[int]]) -> Coordinate:
+        """Get the index of the block whose write ROI contains ``position``."""
+
+        assert self.__total_roi.contains(position), (
+            f"position {position} is not inside {self.__total_roi}"
+        )
+
+        return (Coordinate(position) - self.__total_roi.begin) // self.__block_shape
+
+    def __repr__(self) -> str:
+        return (
+            f"Tiling({self.__total_roi!r}, block_shape={self.__block_shape}, "
+            f"context={self.__context})"
+        )
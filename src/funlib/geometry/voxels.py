@@ -0,0 +1,115 @@
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
+
+from ._numpy import import_numpy
+from .coordinate import Coordinate
+from .roi import Roi
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def iter_voxel_coordinates(
+    roi: Roi,
+    voxel_size: Optional[Iterable[int]] = None,
+    chunk_size: int = 2**20,
+    stride: Union[Iterable[int], int] = 1,
+) -> Iterator["np.ndarray"]:
+    """Iterate over the coordinates of all voxels in a ROI, in chunks.
+
+    The voxels are enumerated in C order (the last dimension changes fastest)
+    and yielded as ``int64`` arrays of shape ``(n, dims)`` with
+    ``n <= chunk_size``. Each chunk is computed directly from the linear voxel
+    indices it covers, such that the memory used is bounded by ``chunk_size``
+    independent of the size of the ROI::
+
+        roi = Roi((0, 0), (4, 6))
+        for chunk in iter_voxel_coordinates(roi, voxel_size=(2, 2), chunk_size=4):
+            ...  # [[0, 0], [0, 2], [0, 4], [2, 0]], then [[2, 2], [2, 4]]
+
+    Requires ``numpy``.
+
+    Args:
+
+        roi (:class:`Roi`):
+
+            The bounded ROI to enumerate. Has to be a multiple of
+            ``voxel_size``.
+
+        voxel_size (:class:`Coordinate` or ``tuple``, optional):
+
+            The voxel size in world units. Defaults to one in each dimension.
+
+        chunk_size (``int``, optional):
+
+            The maximal number of coordinates per chunk.
+
+        stride (:class:`Coordinate` or ``int``, optional):
+
+            Only enumerate every ``stride``-th voxel (per dimension), starting
+            at ``roi.begin``. Defaults to one, i.e., every voxel.
+    """
+
+    np = import_numpy("iter_voxel_coordinates")
+
+    if voxel_size is None:
+        voxel_size = (1,) * roi.dims
+    voxel_size = Coordinate(voxel_size)
+    if not isinstance(stride, Iterable):
+        stride = (stride,) * roi.dims
+    stride = Coordinate(stride)
+
+    assert not roi.unbounded, "can only enumerate voxels of bounded ROIs"
+    assert voxel_size.dims == roi.dims, "dimension of voxel size does not match ROI"
+    assert stride.dims == roi.dims, "dimension of stride does not match ROI"
+    assert all(s > 0 for s in stride), "stride has to be positive"
+    assert chunk_size > 0, "chunk size has to be positive"
+
+    if roi.empty:
+        return
+
+    assert roi.begin.is_multiple_of(voxel_size), (
+        "ROI offset is not a multiple of voxel size"
+    )
+    assert roi.shape.is_multiple_of(voxel_size), (
+        "ROI shape is not a multiple of voxel size"
+    )
+
+    step = voxel_size * stride
+    counts = roi.shape.ceil_division(step)
+    num_voxels = 1
+    for c in counts:
+        num_voxels *= c
+
+    begin_array = np.array(roi.begin, dtype=np.int64)
+    step_array = np.array(step, dtype=np.int64)
+
+    for start in range(0, num_voxels, chunk_size):
+        stop = min(start + chunk_size, num_voxels)
+        indices = np.unravel_index(np.arange(start, stop, dtype=np.int64), counts)
+        coordinates = np.stack(indices, axis=1)
+        coordinates *= step_array
+        coordinates += begin_array
+        yield coordinates
+
+
+def count_voxels(
+    roi: Roi,
+    voxel_size: Optional[Iterable[int]] = None,
+    stride: Union[Iterable[int], int] = 1,
+) -> int:
+    """Get the number of coordinates :func:`iter_voxel_coordinates` yields
+    for the same arguments."""
+
+    if roi.empty:
+        return 0
+    assert not roi.unbounded, "can only count voxels of bounded ROIs"
+
+    if voxel_size is None:
+        voxel_size = (1,) * roi.dims
+    if not isinstance(stride, Iterable):
+        stride = (stride,) * roi.dims
+
+    num_voxels = 1
+    for c in roi.shape.ceil_division(Coordinate(voxel_size) * Coordinate(stride)):
+        num_voxels *= c
+    return num_voxels
@@ -0,0 +1,110 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from funlib.geometry import (
+    Roi,
+    RoiPipeline,
+    Tiling,
+    available_backends,
+    coalesce,
+    get_backend,
+    set_backend,
+    use_backend,
+)
+
+
+def test_import_is_lazy():
+    script = (
+        "import sys, funlib.geometry\n"
+        "funlib.geometry.Roi((0, 0), (10, 10)).grow(1, 1)\n"
+        "print('numpy' in sys.modules, 'tempfile' in sys.modules)\n"
+        "print(' '.join(sorted(m for m in sys.modules if m.startswith('funlib.'))))\n"
+        "funlib.geometry.get_backend()\n"
+        "print('numpy' in sys.modules)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout.splitlines()
+    assert output[0].split() == ["False", "False"]
+    assert output[1].split() == [
+        "funlib.geometry",
+        "funlib.geometry._memoize",
+        "funlib.geometry.coordinate",
+        "funlib.geometry.freezable",
+        "funlib.geometry.roi",
+    ]
+    assert output[2] == "False"
+
+
+def test_lazy_exports():
+    import funlib.geometry
+
+    assert funlib.geometry.coalesce is coalesce
+    assert callable(funlib.geometry.distance)
+    assert "OccupancyGrid" in dir(funlib.geometry)
+    assert "PatchSampler" in funlib.geometry.__all__
+    namespace = {}
+    exec("from funlib.geometry import *", namespace)
+    assert namespace["Tiling"] is funlib.geometry.Tiling
+    with pytest.raises(AttributeError):
+        funlib.geometry.does_not_exist  # noqa: B018
+
+
+def test_select(monkeypatch):
+    monkeypatch.delenv("FUNLIB_GEOMETRY_BACKEND", raising=False)
+    default = available_backends()[-1]
+    assert get_backend() == default
+
+    with use_backend("python"):
+        assert get_backend() == "python"
+        # numpy-only features are not affected
+        assert len(Tiling(Roi((0,), (10,)), (5,)).neighbor_table().neighbors) == 2
+    assert get_backend() == default
+
+    try:
+        set_backend("python")
+        assert get_backend() == "python"
+        with use_backend(default):
+            assert get_backend() == default
+        assert get_backend() == "python"
+    finally:
+        set_backend(None)
+    assert get_backend() == default
+
+    with pytest.raises(RuntimeError):
+        set_backend("cupy")
+
+
+def test_environment():
+    env = dict(os.environ, FUNLIB_GEOMETRY_BACKEND="python")
+    output = subprocess.run(
+        [sys.executable, "-c", "import funlib.geometry as g; print(g.get_backend())"],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    ).stdout
+    assert output.strip() == "python"
+
+
+def test_pipeline_backends():
+    rois = [Roi((i, -2 * i), (i % 7, 5)) for i in range(-100, 100)]
+    rois += [Roi((None, 0), (None, 5)), Roi((None, None), (0, 0))]
+    pipeline = (
+        RoiPipeline()
+        .shift((3, -2))
+        .grow(4, (1, 2))
+        .snap_to_grid((8, 4))
+        .intersect(Roi((-50, -60), (100, 90)))
+        .grow(-2, 0)
+        .snap_to_grid((3, 3), mode="closest")
+    )
+
+    with use_backend("python"):
+        expected = pipeline.apply_many(rois)
+    with use_backend("numpy"):
+        assert pipeline.apply_many(rois) == expected
+    assert expected == [pipeline(roi) for roi in rois]
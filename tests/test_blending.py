@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from funlib.geometry import BlendingWeights, Roi, Tiling
+
+
+@pytest.mark.parametrize("mode", ["linear", "cosine"])
+def test_normalization(mode):
+    tiling = Tiling(Roi((0, 0, 0), (40, 40, 36)), (16, 16, 16), context=4)
+    weights = BlendingWeights(tiling, voxel_size=(2, 2, 2), mode=mode)
+
+    normalization = weights.normalization()
+    assert normalization.shape == (24, 24, 22)
+
+    # ramps of neighbours sum to one inside the total ROI
+    inner = (tiling.total_roi - tiling.total_read_roi.begin) // 2
+    np.testing.assert_allclose(normalization[inner.to_slices()], 1.0, rtol=1e-6)
+
+
+def test_cache():
+    tiling = Tiling(Roi((0, 0), (100, 100)), (10, 10), context=2)
+    weights = BlendingWeights(tiling)
+
+    for index in tiling.block_indices():
+        w = weights.weights(index)
+        assert w.shape == tiling.read_roi(index).shape
+        assert not w.flags.writeable
+
+    # interior, 4 faces, 4 corners
+    assert weights.cache_size == 9
+    assert weights.weights((3, 4)) is weights.weights((5, 5))
+
+    interior = weights.weights((3, 4))
+    assert interior[7, 7] == 1.0
+    assert interior[0, 7] == pytest.approx(0.125)
+    assert interior[-1, 7] == pytest.approx(0.125)
+
+    # no ramps towards the boundary
+    corner = weights.weights((0, 0))
+    assert corner[0, 0] == 1.0
+    assert corner[-1, 0] == pytest.approx(0.125)
+
+    weights.clear_cache()
+    assert weights.cache_size == 0
+
+
+def test_truncated_blocks():
+    tiling = Tiling(Roi((0,), (25,)), (10,), context=1)
+    weights = BlendingWeights(tiling)
+
+    assert weights.weights((2,)).shape == (7,)
+    np.testing.assert_allclose(weights.normalization()[1:-1], 1.0)
+
+
+def test_no_context():
+    tiling = Tiling(Roi((0, 0), (20, 20)), (10, 10))
+    weights = BlendingWeights(tiling)
+
+    assert (weights.weights((0, 1)) == 1).all()
+    assert (weights.normalization() == 1).all()
+
+    with pytest.raises(RuntimeError):
+        BlendingWeights(tiling, mode="doesntexist")
+
+
+def test_empty():
+    tiling = Tiling(Roi((None, None), (0, 0)), (8, 8), context=(2, 2))
+    weights = BlendingWeights(tiling, voxel_size=(2, 2))
+
+    assert len(tiling) == 0
+    assert weights.normalization().shape == (0, 0)
@@ -0,0 +1,118 @@
+import itertools
+import random
+
+from funlib.geometry import Roi, coalesce
+
+
+def covered(rois):
+    return {
+        p
+        for roi in rois
+        for p in itertools.product(*(range(b, e) for b, e in zip(roi.begin, roi.end)))
+    }
+
+
+def test_tiles():
+    rois = [Roi((x, y), (10, 10)) for x in range(0, 50, 10) for y in range(0, 30, 10)]
+    assert coalesce(rois) == [Roi((0, 0), (50, 30))]
+
+    rois = [Roi((0, 0), (10, 10)), Roi((10, 0), (10, 10)), Roi((0, 10), (20, 10))]
+    assert coalesce(rois) == [Roi((0, 0), (20, 20))]
+
+
+def test_overlapping():
+    rois = [Roi((0, 0), (10, 10)), Roi((5, 5), (10, 10))]
+    assert coalesce(rois) == rois
+
+    result = coalesce(rois, disjoint=True)
+    assert covered(result) == covered(rois)
+    assert sum(r.size or 0 for r in result) == len(covered(rois))
+    assert len(result) == 3
+
+    # overlapping ROIs that can be partitioned into fewer boxes
+    rois = [Roi((0, 0), (10, 10)), Roi((0, 5), (10, 10)), Roi((0, 12), (10, 10))]
+    assert coalesce(rois) == [Roi((0, 0), (10, 22))]
+
+
+def test_disjoint():
+    rois = [
+        Roi((3, 3), (7, 3)),
+        Roi((7, 8), (2, 3)),
+        Roi((9, 9), (7, 6)),
+        Roi((6, 12), (3, 1)),
+        Roi((2, 8), (3, 7)),
+        Roi((14, 2), (3, 1)),
+    ]
+    result = coalesce(rois)
+    assert covered(result) == covered(rois)
+    assert len(result) <= len(rois)
+
+
+def test_components():
+    rois = [
+        Roi((0, 0, 0), (5, 5, 5)),
+        Roi((100, 100, 100), (5, 5, 5)),
+        Roi((100, 100, 105), (5, 5, 5)),
+        Roi((None, None, None), (0, 0, 0)),
+    ]
+    assert coalesce(rois) == [
+        Roi((0, 0, 0), (5, 5, 5)),
+        Roi((100, 100, 100), (5, 5, 10)),
+    ]
+    assert coalesce([]) == []
+
+
+def test_random():
+    rng = random.Random(0)
+    for _ in range(20):
+        rois = [
+            Roi(
+                (rng.randrange(20), rng.randrange(20), rng.randrange(20)),
+                (rng.randrange(1, 8), rng.randrange(1, 8), rng.randrange(1, 8)),
+            )
+            for _ in range(10)
+        ]
+        result = coalesce(rois)
+
+        # same region, not more boxes than before
+        assert covered(result) == covered(rois)
+        assert len(result) <= len(rois)
+
+        result = coalesce(rois, disjoint=True)
+
+        # same region, disjoint boxes
+        assert covered(result) == covered(rois)
+        assert sum(r.size or 0 for r in result) == len(covered(rois))
+
+
+def test_scaling():
+    # a shuffled grid of tiles
+    rois = [Roi((10 * x, 10 * y), (10, 10)) for x in range(40) for y in range(40)]
+    random.Random(0).shuffle(rois)
+    assert coalesce(rois) == [Roi((0, 0), (400, 400))]
+
+    # blocks that only meet at corners can not be merged
+    rois = [
+        Roi((10 * x, 10 * y), (10, 10))
+        for x in range(30)
+        for y in range(30)
+        if (x + y) % 2 == 0
+    ]
+    assert coalesce(rois) == sorted(rois, key=lambda roi: roi.begin)
+
+    # overlapping boxes inducing a grid too large to partition
+    rng = random.Random(0)
+    rois = [
+        Roi(
+            (rng.randrange(60), rng.randrange(60), rng.randrange(60)),
+            (rng.randrange(1, 15), rng.randrange(1, 15), rng.randrange(1, 15)),
+        )
+        for _ in range(80)
+    ]
+    result = coalesce(rois)
+    assert covered(result) == covered(rois)
+    assert len(result) <= len(rois)
+
+    result = coalesce(rois, disjoint=True)
+    assert covered(result) == covered(rois)
+    assert sum(r.size or 0 for r in result) == len(covered(rois))
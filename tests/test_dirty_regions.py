@@ -0,0 +1,97 @@
+import random
+
+import funlib.geometry.coalescing
+from funlib.geometry import Coordinate, DirtyRegions, Roi, Tiling
+
+
+def test_merge():
+    dirty = DirtyRegions()
+    assert dirty.empty
+
+    dirty.add(Roi((10, 10), (5, 5)))
+    dirty.add(Roi((15, 10), (5, 5)))
+    assert dirty.rois == [Roi((10, 10), (10, 5))]
+
+    # contained
+    dirty.add(Roi((11, 11), (2, 2)))
+    assert len(dirty) == 1
+
+    # disjoint
+    dirty.add(Roi((50, 50), (5, 5)))
+    assert len(dirty) == 2
+
+    # bridges the gap between both regions along one axis, but union is not a box
+    dirty.add(Roi((10, 15), (10, 35)))
+    assert len(dirty) == 2
+    assert Roi((10, 10), (10, 40)) in dirty.rois
+
+    # empty ROIs are ignored
+    dirty.add(Roi((None, None), (0, 0)))
+    assert len(dirty) == 2
+
+    assert dirty.bounding_roi() == Roi((10, 10), (45, 45))
+
+    dirty.clear()
+    assert dirty.bounding_roi() is None
+
+
+def test_dilate():
+    dirty = DirtyRegions([Roi((10,), (1,))])
+
+    # output at p reads input [p - 1, p + 3]
+    assert dirty.dilate(1, 3).rois == [Roi((7,), (5,))]
+    assert dirty.dilate(2, 2).rois == [Roi((8,), (5,))]
+
+    affected = dirty.propagate([(2, 2), (Coordinate(1), Coordinate(3)), (1, 1)])
+    assert affected.rois == [Roi((4,), (11,))]
+    assert dirty.propagate([(1, 3)]).rois == dirty.dilate(1, 3).rois
+
+    assert affected.clip(Roi((0,), (10,))).rois == [Roi((4,), (6,))]
+
+
+def test_blocks():
+    tiling = Tiling(Roi((0, 0), (100, 100)), (10, 10))
+    dirty = DirtyRegions([Roi((15, 15), (1, 1)), Roi((95, 0), (10, 10))])
+
+    assert dirty.blocks(tiling) == [(1, 1), (9, 0)]
+
+    affected = dirty.propagate([(5, 5)])
+    assert affected.blocks(tiling) == [
+        (1, 1),
+        (1, 2),
+        (2, 1),
+        (2, 2),
+        (9, 0),
+        (9, 1),
+    ]
+    assert affected.block_rois(tiling)[0] == Roi((10, 10), (10, 10))
+
+
+def test_scaling(monkeypatch):
+    comparisons = 0
+    box_union = funlib.geometry.coalescing._box_union
+
+    def counting_box_union(a, b):
+        nonlocal comparisons
+        comparisons += 1
+        return box_union(a, b)
+
+    monkeypatch.setattr(funlib.geometry.coalescing, "_box_union", counting_box_union)
+
+    rois = [
+        Roi((4 * x, 4 * y, 4 * z), (3, 3, 3))
+        for x in range(10)
+        for y in range(10)
+        for z in range(10)
+    ]
+    random.Random(0).shuffle(rois)
+
+    # disjoint regions are only compared to their neighbours
+    dirty = DirtyRegions(rois)
+    assert len(dirty) == 1000
+    assert comparisons < 10 * len(rois)
+
+    comparisons = 0
+    affected = dirty.dilate(1, 1)
+    assert affected.bounding_roi() == Roi((-1, -1, -1), (41, 41, 41))
+    assert comparisons < 100 * len(rois)
@@ -0,0 +1,86 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from funlib.geometry import Roi, RoiIndex, distance
+
+
+def test_distance():
+    a = Roi((0, 0), (10, 10))
+
+    assert distance(a, Roi((5, 5), (10, 10))) == 0
+    assert distance(a, Roi((10, 0), (10, 10))) == 0
+    assert distance(a, Roi((13, 14), (10, 10))) == 5.0
+    assert distance(a, Roi((13, 14), (10, 10)), norm=1) == 7
+    assert distance(a, Roi((13, 14), (10, 10)), norm=math.inf) == 4
+    assert distance(Roi((13, 14), (10, 10)), a) == 5.0
+
+    assert distance(a, (5, 5)) == 0
+    assert distance(a, (-3, 14)) == 5.0
+    assert distance(a, (-3, None)) == 3.0
+
+    # unbounded dimensions
+    assert distance(Roi((0, None), (10, None)), (20, 1000)) == 10.0
+
+    assert distance(a, Roi((None, None), (0, 0))) == math.inf
+
+    with pytest.raises(RuntimeError):
+        distance(a, (0, 0), norm=3)
+
+
+def random_rois(rng, num):
+    return [
+        Roi(
+            (rng.randrange(1000), rng.randrange(1000), rng.randrange(1000)),
+            (rng.randrange(1, 50), rng.randrange(1, 50), rng.randrange(1, 50)),
+        )
+        for _ in range(num)
+    ]
+
+
+@pytest.mark.parametrize("norm", [1, 2, math.inf])
+def test_index(norm):
+    rng = random.Random(0)
+    rois = random_rois(rng, 2000)
+    rois.append(Roi((None, None, None), (0, 0, 0)))
+    rois.append(Roi((0, None, 0), (10, None, 10)))
+
+    index = RoiIndex(rois, leaf_size=8)
+    assert len(index) == len(rois)
+
+    queries = [(500, 500, 500), (-100, 2000, 30), Roi((10, 10, 10), (50, 5, 5))]
+    distances_many = index.distances_many(queries, norm)
+    assert distances_many.shape == (len(queries), len(rois))
+
+    for query, query_distances in zip(queries, distances_many):
+        expected = np.array([distance(roi, query, norm) for roi in rois])
+        np.testing.assert_allclose(index.distances(query, norm), expected)
+        np.testing.assert_allclose(query_distances, expected)
+
+        nearest = index.nearest(query, k=10, norm=norm)
+        assert len(nearest) == 10
+        distances = [d for _, d in nearest]
+        assert distances == sorted(distances)
+        assert distances[-1] == pytest.approx(np.sort(expected)[9])
+        for i, d in nearest:
+            assert d == pytest.approx(distance(rois[i], query, norm))
+
+
+def test_index_special():
+    assert RoiIndex([]).nearest((0, 0)) == []
+    assert RoiIndex([]).distances((1, 2)).shape == (0,)
+    assert RoiIndex([]).distances_many([(1, 2), (3, 4)]).shape == (2, 0)
+
+    rois = [Roi((None, None), (0, 0)), Roi((0, 0), (1, 1))]
+    index = RoiIndex(rois)
+    assert index.nearest((4, 5), k=5) == [(1, 5.0)]
+    assert index.nearest(Roi((None, None), (0, 0))) == []
+    assert index.distances((4, 5)).tolist() == [math.inf, 5.0]
+    assert index.distances_many([(4, 5), Roi((None, None), (0, 0))]).tolist() == [
+        [math.inf, 5.0],
+        [math.inf, math.inf],
+    ]
+
+    assert index.nearest_many([(0, 0), (2, 1)]) == [[(1, 0.0)], [(1, 1.0)]]
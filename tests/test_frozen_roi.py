@@ -0,0 +1,73 @@
+import copy
+import pickle
+
+import pytest
+
+from funlib.geometry import Coordinate, FrozenRoi, Roi
+
+
+def test_immutable():
+    roi = FrozenRoi((0, 0), (10, 10))
+
+    with pytest.raises(AttributeError):
+        roi.offset = (1, 1)
+    with pytest.raises(AttributeError):
+        roi.shape = (1, 1)
+    with pytest.raises(AttributeError):
+        roi.set_offset((1, 1))
+    with pytest.raises(AttributeError):
+        roi.foo = 1  # type: ignore[attr-defined]
+    with pytest.raises(TypeError):
+        roi.thaw()
+
+    assert roi.copy() is roi
+    assert copy.deepcopy(roi) is roi
+    assert roi == FrozenRoi((0, 0), (10, 10))
+
+
+def test_compatible():
+    roi = FrozenRoi((0, None), (10, None))
+    assert roi.offset == (0, None)
+    assert roi == Roi((0, None), (10, None))
+    assert Roi((0, None), (10, None)) == roi
+    assert FrozenRoi.from_roi(Roi((0, 0), (1, 1))) == Roi((0, 0), (1, 1))
+
+    assert pickle.loads(pickle.dumps(roi)) == roi
+    assert isinstance(pickle.loads(pickle.dumps(roi)), FrozenRoi)
+
+
+def test_hash():
+    a = FrozenRoi((0, 0), (10, 10))
+    b = FrozenRoi((0, 0), (10, 10))
+    assert len({a, b}) == 1
+
+
+def test_operations():
+    roi = FrozenRoi((1, 1), (10, 10))
+
+    results = [
+        roi.squeeze(0),
+        roi.intersect(Roi((0, 0), (5, 5))),
+        roi.union(Roi((0, 0), (5, 5))),
+        roi.union(Roi((None, None), (0, 0))),
+        roi.shift(Coordinate(1, 1)),
+        roi.snap_to_grid((4, 4)),
+        roi.grow(1, 1),
+        roi + Coordinate(1, 1),
+        roi - 1,
+        roi * 2,
+        roi / 2,
+        roi // 2,
+    ]
+    assert all(isinstance(r, FrozenRoi) for r in results)
+
+    assert roi.grow(1, 1) == Roi((0, 0), (12, 12))
+    assert roi.snap_to_grid((4, 4)) == Roi((0, 0), (12, 12))
+    assert repr(roi) == "FrozenRoi((1, 1), (10, 10))"
+
+
+def test_subdivide():
+    roi = FrozenRoi((0, 0), (4, 4))
+    leaves = list(roi.subdivide(predicate=lambda r: True))
+    assert len(leaves) == 16
+    assert all(isinstance(leaf, FrozenRoi) for leaf in leaves)
@@ -0,0 +1,70 @@
+import threading
+
+from funlib.geometry import (
+    Coordinate,
+    CoordinateInterner,
+    get_default_interner,
+    intern_coordinate,
+)
+
+
+def test_intern():
+    interner = CoordinateInterner(maxsize=2)
+
+    a = interner.intern(1, 2, 3)
+    assert isinstance(a, Coordinate)
+    assert interner.intern((1, 2, 3)) is a
+    assert interner.intern([1, 2, 3]) is a
+    assert interner.intern(Coordinate(1, 2, 3)) is a
+    assert interner.intern((1.0, 2.0, 3.0)) is a
+
+    # converted to a Coordinate first, then found
+    assert interner.intern((1.5, 2.5, 3.5)) is a
+
+    assert interner.intern(None, 1) == (None, 1)
+
+    info = interner.cache_info()
+    assert info.hits == 5
+    assert info.misses == 2
+    assert info.currsize == 2
+    assert info.maxsize == 2
+
+
+def test_eviction():
+    interner = CoordinateInterner(maxsize=2)
+
+    a = interner.intern(0, 0)
+    interner.intern(1, 1)
+    interner.intern(0, 0)  # a is now the most recently used
+    interner.intern(2, 2)  # evicts (1, 1)
+
+    assert len(interner) == 2
+    assert interner.intern(0, 0) is a
+    assert interner.cache_info().misses == 3
+    interner.intern(1, 1)
+    assert interner.cache_info().misses == 4
+
+    interner.clear()
+    assert interner.cache_info() == (0, 0, 2, 0)
+
+
+def test_threads():
+    interner = CoordinateInterner()
+    results = []
+
+    def target():
+        results.extend(interner.intern(i % 10, 1) for i in range(1000))
+
+    threads = [threading.Thread(target=target) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(interner) == 10
+    assert len({id(c) for c in results}) == 10
+
+
+def test_default():
+    assert intern_coordinate(4, 4, 40) is intern_coordinate((4, 4, 40))
+    assert get_default_interner().cache_info().currsize >= 1
@@ -0,0 +1,107 @@
+import random
+import weakref
+
+import pytest
+
+from funlib.geometry import Roi, read_rois, sort_rois, spatial_join, write_rois
+
+
+def brute_force(rois_a, rois_b):
+    return sorted(
+        (i, j, a.intersect(b)) for i, a in rois_a for j, b in rois_b if a.intersects(b)
+    )
+
+
+def random_rois(rng, num):
+    return [
+        Roi(
+            (rng.randrange(200), rng.randrange(200)),
+            (rng.randrange(1, 20), rng.randrange(1, 20)),
+        )
+        for _ in range(num)
+    ]
+
+
+def test_spatial_join():
+    rng = random.Random(0)
+    for axis in (0, 1):
+        rois_a = sorted(
+            enumerate(random_rois(rng, 150)), key=lambda x: x[1].begin[axis]
+        )
+        rois_b = sorted(
+            enumerate(random_rois(rng, 100)), key=lambda x: x[1].begin[axis]
+        )
+
+        pairs = sorted(spatial_join(rois_a, rois_b, axis=axis), key=repr)
+        assert pairs == sorted(brute_force(rois_a, rois_b), key=repr)
+        assert len(pairs) > 0
+
+
+def test_bounded_memory():
+    alive = [0]
+    max_alive = [0]
+
+    def released():
+        alive[0] -= 1
+
+    def stream(num):
+        for i in range(num):
+            roi = Roi((i, 0), (3, 10))
+            alive[0] += 1
+            weakref.finalize(roi, released)
+            max_alive[0] = max(max_alive[0], alive[0])
+            yield roi
+
+    # a sparse second stream
+    rois_b = [Roi((10, 0), (1, 1)), Roi((5000, 5), (1, 1))]
+    pairs = list(spatial_join(stream(10000), rois_b))
+    assert [(i, j) for i, j, _ in pairs] == [(8, 0), (9, 0), (10, 0)] + [
+        (4998, 1),
+        (4999, 1),
+        (5000, 1),
+    ]
+    assert max_alive[0] < 10
+
+    # the other stream is exhausted
+    max_alive[0] = 0
+    assert len(list(spatial_join(stream(10000), [Roi((0, 0), (1, 1))]))) == 1
+    assert max_alive[0] < 10
+
+
+def test_special_rois():
+    rois_a = [Roi((None, 0), (None, 10)), Roi((None, None), (0, 0))]
+    rois_b = [Roi((5, 5), (10, 10)), Roi((100, 20), (1, 1))]
+
+    assert list(spatial_join(rois_a, rois_b)) == [(0, 0, Roi((5, 5), (10, 5)))]
+
+    with pytest.raises(RuntimeError):
+        list(spatial_join(rois_a, rois_b[::-1]))
+
+
+def test_files(tmp_path):
+    rng = random.Random(1)
+    rois_a = random_rois(rng, 200)
+    rois_b = random_rois(rng, 150) + [Roi((None, 3), (None, 4))]
+
+    assert write_rois(tmp_path / "a.txt", rois_a) == 200
+    write_rois(tmp_path / "b.txt", (("b%d" % i, roi) for i, roi in enumerate(rois_b)))
+
+    assert [roi for _, roi in read_rois(tmp_path / "a.txt")] == rois_a
+    assert next(read_rois(tmp_path / "b.txt")) == ("b0", rois_b[0])
+
+    sort_rois(tmp_path / "a.txt", tmp_path / "a_sorted.txt", batch_size=32)
+    sort_rois(tmp_path / "b.txt", tmp_path / "b_sorted.txt", batch_size=32)
+    assert list(tmp_path.glob("*.rois")) == []
+
+    sorted_a = list(read_rois(tmp_path / "a_sorted.txt"))
+    assert len(sorted_a) == 200
+    assert [roi.begin[0] for _, roi in sorted_a] == sorted(r.begin[0] for r in rois_a)
+
+    pairs = spatial_join(
+        read_rois(tmp_path / "a_sorted.txt"), read_rois(tmp_path / "b_sorted.txt")
+    )
+    expected = brute_force(
+        [(str(i), roi) for i, roi in enumerate(rois_a)],
+        [("b%d" % i, roi) for i, roi in enumerate(rois_b)],
+    )
+    assert sorted(pairs, key=repr) == sorted(expected, key=repr)
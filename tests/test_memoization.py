@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from funlib.geometry import (
+    Coordinate,
+    FrozenRoi,
+    Roi,
+    RoiCache,
+    disable_roi_memoization,
+    enable_roi_memoization,
+    get_roi_cache,
+    memoize_roi_operations,
+)
+
+
+def test_scoped():
+    roi = Roi((1, 1), (10, 10))
+    assert get_roi_cache() is None
+
+    with memoize_roi_operations(RoiCache(maxsize=16)) as cache:
+        assert get_roi_cache() is cache
+
+        a = roi.snap_to_grid((4, 4))
+        b = Roi((1, 1), (10, 10)).snap_to_grid(Coordinate(4, 4))
+        assert a == b == Roi((0, 0), (12, 12))
+
+        # results behave exactly as without memoization
+        assert type(b) is Roi
+        assert a is not b
+        b.shape = (4, 4)
+        assert b.copy() is not b
+        assert roi.snap_to_grid((4, 4)) == Roi((0, 0), (12, 12))
+
+        # different arguments
+        assert roi.snap_to_grid((4, 4), mode="shrink") == Roi((4, 4), (4, 4))
+        assert roi.grow(1, 1) == Roi((0, 0), (12, 12))
+        assert roi.grow(1, 1) == roi.grow(1, 1)
+        assert roi.intersect(Roi((0, 0), (5, 5))) == Roi((1, 1), (4, 4))
+        assert roi.intersect(Roi((0, 0), (5, 5))) == roi.intersect(Roi((0, 0), (5, 5)))
+
+        info = cache.cache_info()
+        assert info.hits == 6
+        assert info.misses == 4
+        assert info.currsize == 4
+        assert cache.hit_rate == pytest.approx(6 / 10)
+
+        # errors are not cached
+        with pytest.raises(RuntimeError):
+            roi.snap_to_grid((4, 4), mode="doesntexist")
+
+    assert get_roi_cache() is None
+    assert not isinstance(roi.snap_to_grid((4, 4)), FrozenRoi)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hit_rate == 0.0
+
+
+def test_eviction():
+    roi = Roi((0,), (10,))
+    with memoize_roi_operations(RoiCache(maxsize=2)) as cache:
+        for i in range(10):
+            roi.grow(i, i)
+        assert len(cache) == 2
+        assert cache.cache_info().misses == 10
+
+
+def test_global():
+    cache = enable_roi_memoization(RoiCache())
+    try:
+        results = []
+
+        def target():
+            results.append(Roi((0, 0), (7, 7)).snap_to_grid((2, 2)))
+
+        threads = [threading.Thread(target=target) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert get_roi_cache() is cache
+        assert all(r == results[0] for r in results)
+        assert cache.cache_info().misses == 1
+
+        # scoped cache takes precedence
+        with memoize_roi_operations() as scoped:
+            Roi((0, 0), (7, 7)).snap_to_grid((2, 2))
+            assert len(scoped) == 1
+    finally:
+        disable_roi_memoization()
+
+    assert get_roi_cache() is None
@@ -0,0 +1,78 @@
+import numpy as np
+
+from funlib.geometry import OccupancyGrid, Roi, Tiling
+
+
+def test_count():
+    total_roi = Roi((-10, 5), (100, 95))
+    rng = np.random.default_rng(0)
+    counts = rng.integers(0, 3, size=(10, 10)) * (rng.random((10, 10)) < 0.2)
+    grid = OccupancyGrid(total_roi, (10, 10), counts=counts)
+
+    assert grid.count(total_roi) == counts.sum()
+    assert grid.count(Roi((None, None), (None, None))) == counts.sum()
+    assert grid.count(Roi((200, 200), (10, 10))) == 0
+    assert not grid.occupied(Roi((200, 200), (10, 10)))
+
+    for _ in range(100):
+        offset = rng.integers(-20, 100, size=2)
+        shape = rng.integers(1, 50, size=2)
+        roi = Roi(offset, shape)
+
+        # cells that overlap the ROI
+        begin = np.clip((offset - (-10, 5)) // 10, 0, 10)
+        end = np.clip(-(((-10, 5) - offset - shape) // 10), 0, 10)
+        expected = counts[begin[0] : end[0], begin[1] : end[1]].sum()
+
+        assert grid.count(roi) == expected
+        assert grid.occupied(roi) == (expected > 0)
+
+
+def test_add():
+    grid = OccupancyGrid(Roi((0, 0, 0), (100, 100, 100)), (10, 10, 10))
+    assert not grid.occupied(grid.total_roi)
+
+    grid.add(Roi((12, 0, 95), (1, 1, 1)))
+    assert grid.occupied(grid.total_roi)
+    assert grid.occupied(Roi((10, 9, 90), (1, 1, 1)))
+    assert not grid.occupied(Roi((20, 0, 90), (10, 10, 10)))
+    assert grid.counts[1, 0, 9] == 1
+
+    # clipped to the total ROI, overlaps 2 x 2 x 1 cells
+    grid.add(Roi((15, 5, 95), (10, 10, 10)), count=2)
+    assert grid.count(grid.total_roi) == 1 + 2 * 4
+
+    other = OccupancyGrid.from_rois(
+        grid.total_roi, (10, 10, 10), [Roi((12, 0, 95), (1, 1, 1))]
+    )
+    assert other.count(grid.total_roi) == 1
+
+
+def test_occupied_blocks():
+    total_roi = Roi((0, 0), (100, 100))
+    mask = np.zeros((20, 20), dtype=bool)
+    mask[3, 3] = True
+    mask[19, 0] = True
+    grid = OccupancyGrid(total_roi, (5, 5), counts=mask)
+
+    tiling = Tiling(total_roi, (40, 40), context=5)
+    assert grid.occupied_blocks(tiling) == [(0, 0), (2, 0)]
+
+    # the read ROI of (0, 1) reaches into cell (3, 7)
+    mask[3, 8] = True
+    grid = OccupancyGrid(total_roi, (5, 5), counts=mask)
+    assert grid.occupied_blocks(tiling) == [(0, 0), (0, 1), (2, 0)]
+    mask[3, 8] = False
+    mask[3, 7] = True
+    grid = OccupancyGrid(total_roi, (5, 5), counts=mask)
+    assert grid.occupied_blocks(tiling) == [(0, 0), (2, 0)]
+    assert grid.occupied_blocks(tiling, read_roi=True) == [(0, 0), (0, 1), (2, 0)]
+
+    # tiling that only partially overlaps the grid
+    tiling = Tiling(Roi((-50, 50), (300, 30)), (50, 10))
+    expected = [
+        index
+        for index in tiling.block_indices()
+        if grid.occupied(tiling.write_roi(index))
+    ]
+    assert grid.occupied_blocks(tiling) == expected
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from funlib.geometry import Coordinate, Roi, RoiPipeline
+
+
+def test_pipeline():
+    total_roi = Roi((0, 0, 0), (100, 100, 100))
+    pipeline = (
+        RoiPipeline()
+        .shift(Coordinate(3, 3, 3))
+        .grow(Coordinate(5, 5, 5), Coordinate(5, 5, 5))
+        .snap_to_grid((4, 4, 4))
+        .intersect(total_roi)
+    )
+
+    roi = Roi((10, 20, 90), (20, 20, 20))
+    expected = (
+        roi.shift(Coordinate(3, 3, 3))
+        .grow(Coordinate(5, 5, 5), Coordinate(5, 5, 5))
+        .snap_to_grid((4, 4, 4))
+        .intersect(total_roi)
+    )
+    assert pipeline(roi) == expected
+    assert pipeline.apply_many([roi, roi]) == [expected, expected]
+
+
+def test_simplify():
+    pipeline = (
+        RoiPipeline()
+        .shift(1)
+        .grow(1, 2)
+        .shift(Coordinate(1, 2))
+        .snap_to_grid((2, 2))
+        .snap_to_grid((2, 2))
+        .intersect(Roi((0, 0), (10, 10)))
+        .intersect(Roi((5, 5), (10, 10)))
+    )
+    assert pipeline.steps == (
+        ("shift_grow", (2, 3), 1, 2),
+        ("snap_to_grid", (2, 2), "grow"),
+        ("intersect", Roi((5, 5), (5, 5))),
+    )
+
+    with pytest.raises(RuntimeError):
+        RoiPipeline().snap_to_grid((2, 2), "doesntexist")
+
+
+def test_special_rois():
+    pipeline = (
+        RoiPipeline()
+        .grow(1, 1)
+        .snap_to_grid((2, 2))
+        .intersect(Roi((0, None), (10, None)))
+    )
+
+    roi = Roi((1, None), (4, None))
+    assert pipeline(roi) == roi.grow(1, 1).snap_to_grid((2, 2)).intersect(
+        Roi((0, None), (10, None))
+    )
+
+    empty = Roi((None, None), (0, 0))
+    assert pipeline(empty) == empty.grow(1, 1).snap_to_grid((2, 2)).intersect(
+        Roi((0, None), (10, None))
+    )
+
+    # no overlap, subsequent steps are still applied to the empty ROI
+    pipeline = RoiPipeline().intersect(Roi((0, 0), (1, 1))).shift(1)
+    assert pipeline(Roi((50, 50), (1, 1))) == Roi((None, None), (0, 0))
+    pipeline = pipeline.grow(1, 1)
+    assert pipeline(Roi((50, 50), (1, 1))) == Roi((None, None), (2, 2))
+
+
+@pytest.mark.parametrize("mode", ["grow", "shrink", "closest"])
+def test_random(mode):
+    rng = random.Random(1)
+
+    def r():
+        return rng.randrange(-20, 20)
+
+    for _ in range(200):
+        shift = Coordinate(r(), r())
+        neg, pos = Coordinate(r(), r()), rng.randrange(-5, 5)
+        voxel_size = Coordinate(rng.randrange(1, 7), rng.randrange(1, 7))
+        other = Roi((r(), r()), (rng.randrange(0, 40), rng.randrange(0, 40)))
+        roi = Roi((r(), r()), (rng.randrange(0, 40), rng.randrange(0, 40)))
+
+        pipeline = (
+            RoiPipeline()
+            .shift(shift)
+            .grow(neg, pos)
+            .snap_to_grid(voxel_size, mode)
+            .intersect(other)
+            .shift(-shift)
+        )
+        expected = (
+            roi.shift(shift)
+            .grow(neg, pos)
+            .snap_to_grid(voxel_size, mode)
+            .intersect(other)
+            .shift(-shift)
+        )
+        assert pipeline(roi) == expected
@@ -0,0 +1,59 @@
+import pytest
+
+from funlib.geometry import Roi, plan_rechunk
+
+
+def test_aligned():
+    total_roi = Roi((0, 0, 0), (1024, 4096, 4096))
+    plan = plan_rechunk(total_roi, (1, 4096, 4096), (64, 64, 64), 1, 2**30)
+
+    assert plan.block_shape == (64, 4096, 4096)
+    assert len(plan) == 16
+    assert plan.read_amplification == 1.0
+    assert plan.read_bytes == plan.write_bytes == total_roi.size
+    assert plan.memory == 2**30
+
+    with pytest.raises(RuntimeError):
+        plan_rechunk(total_roi, (1, 4096, 4096), (64, 64, 64), 1, 2**30 - 1)
+
+
+def test_budget():
+    total_roi = Roi((-30, 0, 7), (1000, 1000, 1000))
+
+    previous_reads = None
+    for max_memory in (2**24, 2**26, 2**28, 2**31):
+        plan = plan_rechunk(total_roi, (100, 100, 100), (64, 64, 64), 2, max_memory)
+
+        assert all(s % 64 == 0 for s in plan.block_shape)
+        assert plan.memory <= max_memory
+        assert plan.write_bytes == 2 * (total_roi.size or 0)
+        assert plan.num_source_chunks == 11 * 10 * 11
+
+        blocks = list(plan.blocks())
+        assert len(blocks) == len(plan)
+        assert sum(w.size or 0 for _, w in blocks) == total_roi.size
+        assert 2 * sum(r.size or 0 for r, _ in blocks) == plan.read_bytes
+        assert 2 * max(r.size or 0 for r, _ in blocks) == plan.memory
+        for read_roi, write_roi in blocks:
+            assert read_roi.contains(write_roi)
+            assert total_roi.contains(write_roi)
+            assert read_roi == read_roi.snap_to_grid((100, 100, 100))
+
+        # more memory never reads more
+        if previous_reads is not None:
+            assert plan.read_bytes <= previous_reads
+        previous_reads = plan.read_bytes
+
+    assert plan.read_amplification < 1.1
+
+
+def test_voxel_size():
+    total_roi = Roi((0, 0), (400, 400))
+    plan = plan_rechunk(
+        total_roi, (40, 400), (400, 40), 4, 400 * 400, voxel_size=(4, 4)
+    )
+
+    # 100 x 100 voxels of 4 bytes
+    assert plan.write_bytes == 40000
+    assert plan.read_bytes == 40000
+    assert plan.block_shape == (400, 400)
@@ -144,3 +144,68 @@ def test_arithmetic():
     assert a * 2 == Roi((2, None), (14, None))
     assert a / 2 == Roi((0, None), (3, None))
     assert a // 2 == Roi((0, None), (3, None))
+
+
+def test_subdivide():
+    roi = Roi((0, 0), (64, 64))
+
+    # split everything down to the minimal shape
+    leaves = list(roi.subdivide(predicate=lambda r: True, min_shape=(16, 16)))
+    assert len(leaves) == 16
+    assert all(leaf.shape == (16, 16) for leaf in leaves)
+    assert leaves[0] == Roi((0, 0), (16, 16))
+    assert leaves[1] == Roi((0, 16), (16, 16))
+
+    # only refine around a point of interest
+    point = Coord(5, 60)
+    leaves = list(
+        roi.subdivide(
+            cost=lambda r: (r.size or 0) if r.contains(point) else 0, max_cost=16
+        )
+    )
+    assert sum(leaf.size or 0 for leaf in leaves) == roi.size
+    assert Roi((4, 60), (4, 4)) in leaves
+    assert Roi((32, 32), (32, 32)) in leaves
+    assert len(leaves) == 3 + 3 + 3 + 4
+
+    leaves = list(roi.subdivide(predicate=lambda r: True, max_depth=1))
+    assert len(leaves) == 4
+
+    # empty children would be split forever
+    with pytest.raises(AssertionError):
+        next(Roi((0,), (4,)).subdivide(lambda r: True, min_shape=0))
+    with pytest.raises(AssertionError):
+        next(roi.subdivide(lambda r: True, min_shape=(16, -1)))
+
+
+def test_subdivide_aligned():
+    roi = Roi((0, 0, 0), (40, 40, 12))
+    visited = []
+
+    def predicate(r):
+        visited.append(r)
+        return True
+
+    leaves = roi.subdivide(predicate=predicate, voxel_size=(4, 4, 4))
+    first = next(leaves)
+
+    # lazy, depth first: only the path to the first leaf has been visited
+    assert [r.begin for r in visited] == [(0, 0, 0)] * len(visited)
+    assert first.begin == (0, 0, 0)
+    assert all(leaf.shape.is_multiple_of(Coord(4, 4, 4)) for leaf in leaves)
+    assert all(leaf.begin.is_multiple_of(Coord(4, 4, 4)) for leaf in visited)
+
+    # last dimension can not be split into children of at least 8
+    leaves = list(
+        roi.subdivide(predicate=lambda r: True, voxel_size=(4, 4, 4), min_shape=8)
+    )
+    assert all(leaf.shape[2] == 12 for leaf in leaves)
+
+    with pytest.raises(AssertionError):
+        next(roi.subdivide())
+
+    # not aligned with the voxel size
+    with pytest.raises(AssertionError):
+        next(
+            Roi((2, 0, 0), (40, 40, 12)).subdivide(lambda r: True, voxel_size=(4, 4, 4))
+        )
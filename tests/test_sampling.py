@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from funlib.geometry import PatchSampler, Roi
+
+
+def test_uniform():
+    total_roi = Roi((1, -10), (100, 50))
+    sampler = PatchSampler(total_roi, (20, 10), voxel_size=(4, 5), seed=1)
+
+    # offsets 4..80 and -10..30
+    assert sampler.num_positions == 20 * 9
+
+    offsets = sampler.sample(10000)
+    assert offsets.shape == (10000, 2)
+    assert offsets.dtype == np.int64
+    assert (offsets % (4, 5) == 0).all()
+    assert offsets[:, 0].min() == 4 and offsets[:, 0].max() == 80
+    assert offsets[:, 1].min() == -10 and offsets[:, 1].max() == 30
+
+    assert all(total_roi.contains(roi) for roi in sampler.rois(offsets))
+
+    # reproducible
+    other = PatchSampler(total_roi, (20, 10), voxel_size=(4, 5), seed=1)
+    assert (other.sample(10000) == offsets).all()
+
+
+def test_mask():
+    total_roi = Roi((0, 0), (100, 100))
+    mask = np.zeros((10, 10), dtype=bool)
+    mask[2, 7] = True
+    mask[9, 9] = True
+
+    sampler = PatchSampler(
+        total_roi, (10, 10), weights=mask, weights_voxel_size=(10, 10), seed=3
+    )
+    centers = sampler.sample(5000) + 5
+
+    in_first = (centers // 10 == (2, 7)).all(axis=1)
+    in_second = (centers // 10 == (9, 9)).all(axis=1)
+    assert (in_first | in_second).all()
+
+    # the cell at the corner only contains 6x6 valid centers, the other 10x10
+    assert in_first.mean() == pytest.approx(100 / 136, abs=0.03)
+
+
+def test_weights():
+    total_roi = Roi((0,), (20,))
+    weights = np.array([1.0, 3.0])
+
+    sampler = PatchSampler(
+        total_roi, (1,), weights=weights, weights_voxel_size=(10,), seed=0
+    )
+    offsets = sampler.sample(20000)
+    assert (offsets >= 10).mean() == pytest.approx(0.75, abs=0.02)
+
+    with pytest.raises(RuntimeError):
+        PatchSampler(total_roi, (1,), weights=[0, 0], weights_voxel_size=(10,))
+
+
+def test_too_small():
+    with pytest.raises(RuntimeError):
+        PatchSampler(Roi((1,), (8,)), (8,), voxel_size=(4,))
@@ -0,0 +1,91 @@
+from funlib.geometry import Coordinate, Roi, Tiling
+
+
+def test_tiling():
+    tiling = Tiling(Roi((10, 0), (100, 100)), (40, 50), context=4)
+
+    assert tiling.blocks_per_axis == (3, 2)
+    assert len(tiling) == 6
+    assert list(tiling.block_indices()) == [
+        (0, 0),
+        (0, 1),
+        (1, 0),
+        (1, 1),
+        (2, 0),
+        (2, 1),
+    ]
+
+    assert tiling.write_roi((0, 0)) == Roi((10, 0), (40, 50))
+    assert tiling.write_roi((2, 1)) == Roi((90, 50), (20, 50))
+    assert tiling.read_roi((2, 1)) == Roi((86, 46), (28, 58))
+    assert tiling.total_read_roi == Roi((6, -4), (108, 108))
+
+    assert tiling.block_index((10, 0)) == (0, 0)
+    assert tiling.block_index((89, 99)) == (1, 1)
+    assert tiling.block_index((90, 50)) == (2, 1)
+
+    # write ROIs partition the total ROI
+    write_rois = [tiling.write_roi(i) for i in tiling.block_indices()]
+    assert sum(r.size or 0 for r in write_rois) == tiling.total_roi.size
+
+
+def test_asymmetric_context():
+    tiling = Tiling(Roi((0, 0), (10, 10)), (5, 5), context=Coordinate(1, 0))
+    assert tiling.read_roi((1, 1)) == Roi((4, 5), (7, 5))
+    assert not tiling.contains_index((2, 0))
+
+
+def test_neighbors():
+    tiling = Tiling(Roi((0, 0), (100, 90)), (40, 40), context=4)
+
+    assert tiling.linear_index((0, 0)) == 0
+    assert tiling.linear_index((1, 2)) == 5
+    assert [tiling.linear_index(i) for i in tiling.block_indices()] == list(range(9))
+
+    neighbors = tiling.neighbors((1, 1))
+    assert len(neighbors) == 8
+    assert neighbors[0].index == (0, 0)
+    assert neighbors[0].direction == (-1, -1)
+    assert neighbors[0].halo_in == Roi((36, 36), (4, 4))
+    assert neighbors[0].halo_out == Roi((40, 40), (4, 4))
+
+    right = [n for n in neighbors if n.direction == (0, 1)][0]
+    assert right.index == (1, 2)
+    assert right.halo_in == Roi((40, 80), (40, 4))
+    assert right.halo_out == Roi((40, 76), (40, 4))
+
+    # corner block
+    neighbors = tiling.neighbors((2, 2))
+    assert [n.index for n in neighbors] == [(1, 1), (1, 2), (2, 1)]
+    assert neighbors[1].halo_in == Roi((76, 80), (4, 10))
+
+
+def test_neighbor_table():
+    tiling = Tiling(Roi((10, 0, 0), (100, 90, 30)), (40, 40, 10), context=(4, 2, 1))
+    table = tiling.neighbor_table()
+
+    num_blocks = len(tiling)
+    assert table.directions.shape == (26, 3)
+    assert table.neighbors.shape == (num_blocks, 26)
+    assert table.halo_in_begin.shape == (num_blocks, 26, 3)
+
+    directions = [tuple(d) for d in table.directions.tolist()]
+    for index in tiling.block_indices():
+        i = tiling.linear_index(index)
+        neighbors = {n.direction: n for n in tiling.neighbors(index)}
+        for j, direction in enumerate(directions):
+            if direction not in neighbors:
+                assert table.neighbors[i, j] == -1
+                assert (table.halo_in_begin[i, j] == table.halo_in_end[i, j]).all()
+                continue
+            neighbor = neighbors[direction]
+            assert table.neighbors[i, j] == tiling.linear_index(neighbor.index)
+            begin = table.halo_in_begin[i, j]
+            assert Roi(begin, table.halo_in_end[i, j] - begin) == neighbor.halo_in
+
+    # an empty tiling has no blocks
+    table = Tiling(Roi((None, None), (0, 0)), (5, 5)).neighbor_table()
+    assert table.directions.shape == (8, 2)
+    assert table.neighbors.shape == (0, 8)
+    assert table.halo_in_begin.shape == (0, 8, 2)
+    assert table.halo_in_end.shape == (0, 8, 2)
@@ -0,0 +1,52 @@
+import itertools
+
+import numpy as np
+
+from funlib.geometry import Roi, count_voxels, iter_voxel_coordinates
+
+
+def test_iter_voxel_coordinates():
+    roi = Roi((2, -4, 0), (6, 8, 10))
+
+    chunks = list(iter_voxel_coordinates(roi, voxel_size=(2, 2, 1), chunk_size=7))
+    assert all(len(chunk) <= 7 for chunk in chunks)
+    assert all(chunk.dtype == np.int64 for chunk in chunks)
+
+    coordinates = np.concatenate(chunks)
+    expected = list(itertools.product(range(2, 8, 2), range(-4, 4, 2), range(10)))
+    assert coordinates.tolist() == [list(e) for e in expected]
+    assert len(coordinates) == count_voxels(roi, voxel_size=(2, 2, 1))
+
+
+def test_stride():
+    roi = Roi((0, 0), (10, 9))
+
+    coordinates = np.concatenate(list(iter_voxel_coordinates(roi, stride=(4, 3))))
+    assert coordinates.tolist() == [
+        [0, 0],
+        [0, 3],
+        [0, 6],
+        [4, 0],
+        [4, 3],
+        [4, 6],
+        [8, 0],
+        [8, 3],
+        [8, 6],
+    ]
+    assert count_voxels(roi, stride=(4, 3)) == 9
+
+
+def test_large_roi():
+    roi = Roi((0, 0, 0), (10000, 10000, 10000))
+    assert count_voxels(roi) == 10**12
+
+    chunks = iter_voxel_coordinates(roi, chunk_size=1000)
+    first = next(chunks)
+    assert first.shape == (1000, 3)
+    assert first[-1].tolist() == [0, 0, 999]
+
+
+def test_empty():
+    roi = Roi((None, None), (0, 0))
+    assert list(iter_voxel_coordinates(roi)) == []
+    assert count_voxels(roi) == 0